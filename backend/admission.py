@@ -0,0 +1,170 @@
+"""
+Admission control for the API
+Requests are sorted into lanes. Each lane has a per-client token bucket and a
+limited number of concurrency slots with a short, bounded wait queue; requests
+that would exceed either get 429/503 with Retry-After instead of piling up on
+the event loop. /health, /metrics, / and the event stream bypass admission, and
+it is installed inside the response cache, so cached reads never wait for a slot.
+"""
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict
+from fastapi import Request
+from fastapi.responses import JSONResponse
+import metrics
+
+# Header carrying the real client address behind a proxy (e.g. x-forwarded-for on Render);
+# unset means the socket peer address is used, which can't be spoofed
+CLIENT_IP_HEADER = os.getenv('ADMISSION_CLIENT_IP_HEADER', '').lower()
+
+# "off" disables the per-client rate limits (concurrency limits still apply), e.g. for load tests
+RATE_LIMITS_ENABLED = os.getenv('ADMISSION_RATE_LIMITS', 'on').lower() != 'off'
+
+# Heavy reads run in worker threads but are mostly Python (ORM rows, JSON), so more
+# than one at a time mainly fights the event loop for the GIL; PostgreSQL deployments,
+# where more of the time is spent waiting on the database, can raise this
+HEAVY_CONCURRENCY = int(os.getenv('ADMISSION_HEAVY_CONCURRENCY', 1))
+
+# Least recently seen clients are forgotten beyond this many per lane
+MAX_CLIENTS = 10000
+
+EXEMPT_PATHS = {'/', '/health', '/metrics', '/events'}
+JOB_PATHS = {'/refresh', '/full-reload'}
+HEAVY_PATHS = {'/bootstrap', '/dashboard', '/issues', '/issues/changes', '/search', '/trends', '/category-details'}
+
+
+class TokenBuckets:
+    """One token bucket per client: rate tokens per second, holding at most burst"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = OrderedDict()  # client -> (tokens, monotonic time of last update)
+
+    def take(self, client, now):
+        """0 if a token was taken, otherwise seconds until the client has one again"""
+        tokens, updated = self.buckets.pop(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0
+        else:
+            wait = (1 - tokens) / self.rate
+        self.buckets[client] = (tokens, now)
+        while len(self.buckets) > MAX_CLIENTS:
+            self.buckets.popitem(last=False)
+        return wait
+
+
+class Lane:
+    """Concurrency slots and per-client rate limit shared by one class of requests"""
+
+    def __init__(self, name, concurrency, max_waiting, wait_timeout, rate, burst, retry_after):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self.retry_after = retry_after  # suggested to clients turned away for lack of a slot
+        self.buckets = TokenBuckets(rate, burst)
+        self.slots = asyncio.Semaphore(concurrency)
+        self.waiting = 0
+
+    async def acquire(self):
+        """Wait (briefly, and only if few others are waiting) for a slot; False if none came free"""
+        if self.slots.locked() and self.waiting >= self.max_waiting:
+            return False
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self.slots.acquire(), self.wait_timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.waiting -= 1
+        metrics.ADMISSION_WAIT_SECONDS.labels(self.name).observe(time.perf_counter() - start)
+        metrics.ADMISSION_IN_FLIGHT.labels(self.name).inc()
+        return True
+
+    def release(self):
+        metrics.ADMISSION_IN_FLIGHT.labels(self.name).dec()
+        self.slots.release()
+
+
+LANES = {
+    # Only enqueue a run (see jobs.py), but each run costs Jira calls or a full reload
+    'jobs': Lane('jobs', concurrency=1, max_waiting=4, wait_timeout=5, rate=1 / 60, burst=5, retry_after=10),
+    # Streams of the whole table; a slot is held until the body is sent
+    'export': Lane('export', concurrency=2, max_waiting=2, wait_timeout=30, rate=0.1, burst=3, retry_after=30),
+    # Uncached reads that scan or serialize many issues
+    'heavy': Lane('heavy', concurrency=HEAVY_CONCURRENCY, max_waiting=32, wait_timeout=10, rate=5, burst=30,
+                  retry_after=2),
+    'default': Lane('default', concurrency=32, max_waiting=128, wait_timeout=10, rate=20, burst=60, retry_after=1),
+}
+
+
+def lane_for(method, path):
+    """The lane a request is admitted through, or None for the priority paths"""
+    if path in EXEMPT_PATHS or path.startswith('/profiles/'):
+        return None
+    if method == 'POST' and path in JOB_PATHS:
+        return LANES['jobs']
+    if path.startswith('/export/'):
+        return LANES['export']
+    if method == 'GET' and path in HEAVY_PATHS:
+        return LANES['heavy']
+    return LANES['default']
+
+
+def client_id(request):
+    if CLIENT_IP_HEADER:
+        forwarded = request.headers.get(CLIENT_IP_HEADER)
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.client.host if request.client else 'unknown'
+
+
+def reject(status_code, message, retry_after):
+    return JSONResponse(
+        {"success": False, "error": message},
+        status_code=status_code,
+        headers={'Retry-After': str(max(1, math.ceil(retry_after)))}
+    )
+
+
+async def release_after(body_iterator, lane):
+    """Pass a response body through, releasing the lane's slot once it is sent (or abandoned)"""
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        lane.release()
+
+
+def install(app):
+    """Admit requests through their lane (install before the response cache so hits skip it)"""
+
+    @app.middleware("http")
+    async def admission_middleware(request: Request, call_next):
+        lane = lane_for(request.method, request.url.path)
+        if lane is None:
+            return await call_next(request)
+
+        if RATE_LIMITS_ENABLED:
+            wait = lane.buckets.take(client_id(request), time.monotonic())
+            if wait:
+                metrics.ADMISSION_REJECTIONS.labels(lane.name, 'rate').inc()
+                return reject(429, f"Too many {lane.name} requests; retry later", wait)
+
+        if not await lane.acquire():
+            metrics.ADMISSION_REJECTIONS.labels(lane.name, 'busy').inc()
+            return reject(503, f"Server busy with {lane.name} requests; retry later", lane.retry_after)
+
+        try:
+            response = await call_next(request)
+        except BaseException:
+            lane.release()
+            raise
+        response.body_iterator = release_after(response.body_iterator, lane)
+        return response
@@ -0,0 +1,30 @@
+"""
+Move long-closed issues out of the hot issues table into the archive tier
+Run this manually to archive ahead of the daily 3 AM job, or with a different age
+"""
+import os
+import sys
+from dotenv import load_dotenv
+from database import Database, ARCHIVE_AFTER_DAYS
+
+load_dotenv()
+
+
+def main():
+    older_than_days = int(sys.argv[1]) if len(sys.argv) > 1 else ARCHIVE_AFTER_DAYS
+
+    print("="*80)
+    print(f"ARCHIVING issues closed for more than {older_than_days} days")
+    print("="*80)
+
+    db = Database(os.getenv('DATABASE_PATH', './issues.db'))
+    archived = db.archive_closed_issues(older_than_days)
+
+    print(f"\n✅ Archived {archived} issues")
+    print(f"   Hot issues: {len(db.get_all_issues())}")
+    print(f"   Total issues (hot + archive): {db.count_issues()}")
+    print("="*80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark for categorize_issue()
+Compares the current categorizer with the reference implementation kept in
+verify_categorizer.py (the original phrase-by-phrase scans) on synthetic issues
+with short descriptions and with long ones shaped like the str() of Jira ADF
+documents, which is what the fetchers store. Reports issues per second.
+Also times strip_metadata() against the old one-pass-per-field loop on long
+descriptions of growing size, in their original case and lowercased (as
+categorize_issue() passes them), to show cleaning stays linear in the text, and categorize_many() throughput by
+worker count.
+"""
+import os
+import random
+import statistics
+import time
+from datetime import datetime
+from categorizer import categorize_issue, categorize_many, strip_metadata
+from generate_synthetic_data import make_issue
+from verify_categorizer import reference_categorize_issue, reference_strip_metadata
+
+ISSUES = 5000
+RUNS = 5
+
+
+def adf_description(rng, text, paragraphs):
+    """A description as str(adf_dict): text spread over many paragraphs with ADF markup around it"""
+    filler = ['Hi team,', 'Thanks!', 'Please see the attached screenshot.', 'Let me know if you need anything else.',
+              'This came up again on the renewal call today.', 'Adding the carrier confirmation below.']
+    content = [
+        {'type': 'paragraph', 'content': [{'type': 'text', 'text': rng.choice(filler)}]}
+        for _ in range(paragraphs)
+    ]
+    content.insert(rng.randint(0, len(content)), {'type': 'paragraph', 'content': [{'type': 'text', 'text': text}]})
+    return str({'type': 'doc', 'version': 1, 'content': content})
+
+
+def make_cases(long_descriptions):
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    cases = []
+    for i in range(ISSUES):
+        issue = make_issue(rng, i, now)
+        description = issue['description']
+        if long_descriptions:
+            description = adf_description(rng, description, rng.randint(20, 60))
+        cases.append((issue['summary'], description))
+    return cases
+
+
+def issues_per_second(fn, cases):
+    """Median throughput over RUNS passes"""
+    rates = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        for summary, description in cases:
+            fn(summary, description)
+        rates.append(len(cases) / (time.perf_counter() - start))
+    return statistics.median(rates)
+
+
+def main():
+    print("="*80)
+    print(f"CATEGORIZER BENCHMARK ({ISSUES:,} synthetic issues, median of {RUNS} runs)")
+    print("="*80)
+    print(f"{'descriptions':<28} {'avg chars':>10} {'reference/s':>14} {'current/s':>14} {'speedup':>9}")
+
+    for label, long_descriptions in (('short (synthetic)', False), ('long (ADF-derived)', True)):
+        cases = make_cases(long_descriptions)
+        assert all(categorize_issue(*c) == reference_categorize_issue(*c) for c in cases), 'results differ'
+        chars = statistics.mean(len(s) + len(d) for s, d in cases)
+        reference = issues_per_second(reference_categorize_issue, cases)
+        current = issues_per_second(categorize_issue, cases)
+        print(f"{label:<28} {chars:>10,.0f} {reference:>14,.0f} {current:>14,.0f} {current / reference:>8.2f}x")
+
+    print()
+    print("strip_metadata() on ADF-derived descriptions (texts per second)")
+    print(f"{'paragraphs':<12} {'case':<10} {'avg chars':>10} {'sequential/s':>14} {'current/s':>14} {'speedup':>9}")
+    rng = random.Random(7)
+    descriptions = [description for _, description in make_cases(False)][:500]
+    for paragraphs in (10, 100, 1000):
+        texts = [adf_description(rng, description, paragraphs) for description in descriptions]
+        for case, case_texts in (('original', texts), ('lower', [text.lower() for text in texts])):
+            chars = statistics.mean(len(text) for text in case_texts)
+            runs = [(text, None) for text in case_texts]
+            sequential = issues_per_second(lambda text, _: reference_strip_metadata(text), runs)
+            current = issues_per_second(lambda text, _: strip_metadata(text), runs)
+            print(f"{paragraphs:<12} {case:<10} {chars:>10,.0f} {sequential:>14,.0f} {current:>14,.0f} "
+                  f"{current / sequential:>8.2f}x")
+
+    print()
+    cases = make_cases(True) * 4
+    print(f"categorize_many() on {len(cases):,} long issues, {os.cpu_count()} CPU(s) (issues per second)")
+    print(f"{'workers':<12} {'issues/s':>14} {'speedup':>9}")
+    single = None
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        categorize_many(cases, workers=workers)
+        rate = len(cases) / (time.perf_counter() - start)
+        single = single or rate
+        print(f"{workers:<12} {rate:>14,.0f} {rate / single:>8.2f}x")
+
+    print("="*80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Micro-benchmark for JSON encoding of the /issues payload
+Compares FastAPI's default path (jsonable_encoder + json) with orjson at 10k and 100k issues
+"""
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+CATEGORIES = [
+    'Missing SSR', 'Missing Policy Header', 'Missing Policy', 'Account/Client Missing',
+    'Producer Updates', 'Endorsement Issues', 'Premium/Data Entry Issues', 'Account Cleanup/Removal'
+]
+STATUSES = ['Done', 'In Progress', 'Backlog', 'Waiting for support']
+PRIORITIES = ['Highest', 'High', 'Medium', 'Low']
+
+
+def make_issues(count, seed=42):
+    """Issue dicts shaped like build_issue_list() output, with raw datetimes"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    issues = []
+    for i in range(count):
+        created = start + timedelta(minutes=rng.randint(0, 600_000))
+        issues.append({
+            "issue_key": f"NTRI-{i + 1}",
+            "summary": f"Policy header not in EPIC for account {rng.randint(1000, 99999)} - carrier renewal",
+            "status": rng.choice(STATUSES),
+            "category": rng.choice(CATEGORIES),
+            "confidence": float(rng.choice([40, 55, 70, 80, 90, 95, 98])),
+            "priority": rng.choice(PRIORITIES),
+            "created_date": created,
+            "updated_date": created + timedelta(hours=rng.randint(0, 2000))
+        })
+    return issues
+
+
+def best_of(fn, repeat):
+    """Best wall time of fn over repeat runs, and the size of what it produced"""
+    best = None
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn()
+        elapsed = time.perf_counter() - start
+        size = len(body)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, size
+
+
+def default_fastapi(payload):
+    # What FastAPI does for a returned dict: jsonable_encoder, then JSONResponse.render
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def isoformat_then_json(payload):
+    # The old build_issue_list: isoformat() per datetime, then the stdlib encoder
+    data = [
+        {**issue, "created_date": issue["created_date"].isoformat(), "updated_date": issue["updated_date"].isoformat()}
+        for issue in payload["data"]
+    ]
+    return json.dumps({"success": True, "data": data}, separators=(",", ":")).encode("utf-8")
+
+
+def orjson_native(payload):
+    # ORJSONResponse returned directly (same options as its render()): no
+    # jsonable_encoder, datetimes encoded natively
+    return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def main():
+    print("="*80)
+    print("JSON SERIALIZATION BENCHMARK (/issues payload)")
+    print("="*80)
+
+    for count in (10_000, 100_000):
+        payload = {"success": True, "data": make_issues(count)}
+        repeat = 5 if count <= 10_000 else 3
+
+        print(f"\n{count:,} issues")
+        print(f"  {'encoder':<34} {'best ms':>10} {'MB':>8} {'issues/s':>14}")
+        baseline = None
+        for name, fn in [
+            ("jsonable_encoder + json (default)", default_fastapi),
+            ("isoformat + json", isoformat_then_json),
+            ("orjson, native datetimes", orjson_native),
+        ]:
+            elapsed, size = best_of(lambda: fn(payload), repeat)
+            baseline = baseline or elapsed
+            print(f"  {name:<34} {elapsed * 1000:>10.1f} {size / 1e6:>8.2f} {count / elapsed:>14,.0f}"
+                  f"  ({baseline / elapsed:.1f}x)")
+
+    print("\n" + "="*80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark for API startup
+Measures how long `import main` takes (and which imports dominate), how long a
+fresh uvicorn process takes to answer /health, and what the first data request
+costs once the database is opened lazily. JIRA_URL is pointed at an unroutable
+address, so any network call during startup would show up as a multi-second stall.
+"""
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+RUNS = 5
+
+# TEST-NET-1: nothing answers, connections hang until they time out
+UNREACHABLE_JIRA = 'http://192.0.2.1'
+
+
+def startup_env():
+    env = dict(os.environ)
+    env['JIRA_URL'] = UNREACHABLE_JIRA
+    return env
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def measure_import():
+    """(seconds for `import main`, [(cumulative seconds, module)] for the slowest top-level imports)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=BACKEND_DIR, env=startup_env(), capture_output=True, text=True
+    )
+    total = None
+    top_level = []
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)', line)
+        if not match:
+            continue
+        cumulative, indent, module = int(match.group(1)) / 1e6, match.group(2), match.group(3)
+        if module == 'main':
+            total = cumulative
+        elif len(indent) == 2:
+            top_level.append((cumulative, module))
+    if total is None:
+        raise RuntimeError(f"import main failed:\n{result.stderr[-2000:]}")
+    return total, sorted(top_level, reverse=True)[:8]
+
+
+def measure_server():
+    """(seconds until /health answers, seconds for the first /categories) for one fresh process"""
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=BACKEND_DIR, env=startup_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while True:
+            try:
+                if requests.get(f"http://127.0.0.1:{port}/health", timeout=0.5).ok:
+                    break
+            except requests.RequestException:
+                pass
+            if server.poll() is not None:
+                raise RuntimeError('API server exited during startup')
+            if time.perf_counter() - start > 60:
+                raise RuntimeError('API server did not answer /health within 60s')
+            time.sleep(0.01)
+        healthy = time.perf_counter() - start
+
+        first = time.perf_counter()
+        requests.get(f"http://127.0.0.1:{port}/categories", timeout=60)
+        first_request = time.perf_counter() - first
+        return healthy, first_request
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    print("="*80)
+    print(f"STARTUP BENCHMARK ({RUNS} runs each, JIRA_URL={UNREACHABLE_JIRA})")
+    print("="*80)
+
+    imports = [measure_import() for _ in range(RUNS)]
+    print(f"\nimport main: median {statistics.median(t for t, _ in imports) * 1000:.0f} ms, "
+          f"max {max(t for t, _ in imports) * 1000:.0f} ms")
+    print("  slowest top-level imports (last run):")
+    for seconds, module in imports[-1][1]:
+        print(f"    {module:<28} {seconds * 1000:>8.1f} ms")
+
+    runs = [measure_server() for _ in range(RUNS)]
+    healthy = [h for h, _ in runs]
+    first = [f for _, f in runs]
+    print(f"\nprocess start -> /health 200: median {statistics.median(healthy) * 1000:.0f} ms, "
+          f"max {max(healthy) * 1000:.0f} ms")
+    print(f"first /categories (opens the database): median {statistics.median(first) * 1000:.0f} ms, "
+          f"max {max(first) * 1000:.0f} ms")
+    print("\n" + "="*80)
+
+
+if __name__ == '__main__':
+    main()
@@ -137,7 +137,7 @@ def main():
             db.upsert_issue({
                 'issue_key': issue_key,
                 'summary': summary,
-                'description': str(description)[:5000],
+                'description': str(description),
                 'status': status,
                 'priority': priority,
                 'category': category,
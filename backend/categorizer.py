@@ -2,12 +2,64 @@
 Issue categorization logic for EPIC system issues
 """
 
+import hashlib
+import multiprocessing
+import os
 import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# Worker processes categorize_many() uses by default (every core unless set)
+CATEGORIZE_WORKERS = int(os.getenv('CATEGORIZE_WORKERS', 0)) or os.cpu_count() or 1
+
+# Issues sent to a worker at a time; batches no bigger than this stay in-process,
+# where they finish sooner than a pool could start
+CATEGORIZE_CHUNK_SIZE = int(os.getenv('CATEGORIZE_CHUNK_SIZE', 500))
+
+# The categories categorize_issue() can return, and the only valid manual overrides
+CATEGORIES = [
+    'Missing SSR',
+    'Missing Policy Header',
+    'Missing Policy',
+    'Account/Client Missing',
+    'Producer Updates',
+    'Endorsement Issues',
+    'Premium/Data Entry Issues',
+    'Account Cleanup/Removal'
+]
+
+# Stored with every automatic category; bump it whenever a rule change can change any
+# result, so the next recategorization (recalculate_confidence.py) redoes every issue
+RULES_VERSION = 2
+
+# Metadata fields that shouldn't influence categorization, as (label, value) regexes;
+# a field is its label, then colons/whitespace, then its value. Fields are removed in
+# this order, which can change the result when they overlap. Labels are lowercase:
+# ASCII text is matched in lowercase (see strip_metadata)
+METADATA_FIELDS = [
+    ('account name', r'[^\n]+'),
+    (r'case\s*#', r'\d+'),
+    ('policy number', r'[^\n]+'),
+    ('policy type', r'[^\n]+'),
+    ('policy period', r'[^\n]+'),
+    ('insurer', r'[^\n]+'),
+    ('policy term', r'[^\n]+'),
+]
+METADATA_REGEXES = [f'{label}[:\\s]+{value}' for label, value in METADATA_FIELDS]
+METADATA_FIELD_PATTERNS = [re.compile(regex) for regex in METADATA_REGEXES]
+METADATA_FIELD_PATTERNS_IGNORECASE = [re.compile(regex, re.IGNORECASE) for regex in METADATA_REGEXES]
+# Any field anywhere; text this doesn't match has nothing to remove
+METADATA_PATTERN = re.compile('|'.join(METADATA_REGEXES))
+METADATA_PATTERN_IGNORECASE = re.compile('|'.join(METADATA_REGEXES), re.IGNORECASE)
 
 
 def strip_metadata(text):
     """
     Remove common metadata patterns that shouldn't influence categorization.
+    Fields are removed one after another, each from what the earlier ones left;
+    one scan for any field skips the rest for text without metadata.
 
     Args:
         text (str): Text to clean
@@ -15,22 +67,202 @@ def strip_metadata(text):
     Returns:
         str: Text with metadata removed
     """
-    # Patterns that indicate metadata, not actual issue content
-    metadata_patterns = [
-        r'account name[:\s]+[^\n]+',
-        r'case\s*#[:\s]+\d+',
-        r'policy number[:\s]+[^\n]+',
-        r'policy type[:\s]+[^\n]+',
-        r'policy period[:\s]+[^\n]+',
-        r'insurer[:\s]+[^\n]+',
-        r'policy term[:\s]+[^\n]+',
-    ]
-
-    cleaned = text
-    for pattern in metadata_patterns:
-        cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+    if not text.isascii():
+        if METADATA_PATTERN_IGNORECASE.search(text):
+            for pattern in METADATA_FIELD_PATTERNS_IGNORECASE:
+                text = pattern.sub('', text)
+        return text
+
+    # Lowercasing ASCII keeps every character in place, so matches in the lowercase
+    # copy mark the spans to cut from the text; several times faster than IGNORECASE
+    lowered = text.lower()
+    if not METADATA_PATTERN.search(lowered):
+        return text
+    if lowered == text:
+        for pattern in METADATA_FIELD_PATTERNS:
+            text = pattern.sub('', text)
+        return text
+    for pattern in METADATA_FIELD_PATTERNS:
+        spans = [match.span() for match in pattern.finditer(lowered)]
+        if spans:
+            lowered = _cut_spans(lowered, spans)
+            text = _cut_spans(text, spans)
+    return text
+
+
+def _cut_spans(text, spans):
+    """text without the given (start, end) spans, which are sorted and don't overlap"""
+    pieces = []
+    end = 0
+    for start, stop in spans:
+        pieces.append(text[end:start])
+        end = stop
+    pieces.append(text[end:])
+    return ''.join(pieces)
+
+
+# Phrases that identify an issue type outright (98% confidence), checked in this order
+CLEANUP_PHRASES = [
+    'please remove',
+    'delete account',
+    'remove account',
+    'delete this account',
+    'cleanup',
+    'migration cleanup',
+    'remove from 2.0',
+    'remove from epic'
+]
+HEADER_PHRASES = [
+    'header not created',
+    'header not in epic',
+    'header not showing',
+    'header not available',
+    'policy header not created',
+    'policy header not in epic',
+    'header missing',
+    'case issue# header',  # Common pattern
+    'case issue: header',
+    'case issue :header'
+]
+POLICY_PHRASES = [
+    'policy is not in epic',
+    'policy not in epic',
+    'policy is not available',
+    'policy not available',
+    'policy not created',
+    'policy not showing',
+    'policy missing',
+    'policy not found',
+    'policy is missing',
+    'policy did not migrate'
+]
+SSR_PHRASES = [
+    'ssr not created',
+    'ssr not in epic',
+    'ssr not showing',
+    'ssr not available',
+    'ssr missing',
+    'ssr not visible',
+    'ssr is not'
+]
+ACCOUNT_PHRASES = [
+    'account not created',
+    'account not in epic',
+    'account missing',
+    'account is not available',
+    'account not available',
+    'client not in epic',
+    'client missing',
+    'client not found',
+    'account not found',
+    'unable to find given clients',
+    'need a 2.0 account'
+]
+
+# Policy type patterns: "[Type] policy is not in epic"
+POLICY_TYPE_REGEX = r'(worker[s]?\s+compensation|commercial\s+property|general\s+liability|auto|umbrella|liability|property|casualty|workers?\s+comp|wc|gl|comb\s+spec\s+ins)\s+policy\s+(is\s+)?(not\s+in\s+epic|missing|not\s+available|not\s+showing)'
+# The text is lowercased before the search, so IGNORECASE only matters for the two
+# lowercase letters that fold onto ASCII ones (dotless i, long s); without it the
+# regex engine can skip ahead to likely starts, which makes it several times faster
+POLICY_TYPE_PATTERN = re.compile(POLICY_TYPE_REGEX)
+POLICY_TYPE_PATTERN_IGNORECASE = re.compile(POLICY_TYPE_REGEX, re.IGNORECASE)
+
+# Context keywords for the keyword phases
+HEADER_NEGATIVE_KEYWORDS = ['not', 'missing', 'incorrect', 'issue', 'not in epic',
+                            'not updated', 'not created', 'not showing', 'error',
+                            'unavailable', 'not available', 'not visible', 'is not']
+POLICY_MISSING_KEYWORDS = ['missing', 'not available', 'not in epic',
+                           'not showing', 'not found', 'not visible',
+                           'not created', 'is not', 'not migrate',
+                           'did not migrate', 'never set up']
+ACCOUNT_MISSING_KEYWORDS = ['missing', 'not found', 'not available', 'not showing',
+                            'not in epic', 'not visible', 'not created', 'locate',
+                            'unable to find', 'cannot find', 'need']
+SSR_NEGATIVE_KEYWORDS = ['not', 'missing', 'unavailable', 'issue', 'not in epic',
+                         'not available', 'not created', 'not showing', 'not visible',
+                         'is not', 'error']
+PRODUCER_KEYWORDS = ['update', 'change', 'incorrect', 'wrong',
+                     'not reflecting', 'not updated', 'needs update']
+PREMIUM_KEYWORDS = ['premium', 'data entry', 'data error', 'incorrect premium',
+                    'wrong premium', 'amount', 'calculation', 'commission',
+                    'accounting', 'invoice', 'billing']
+DATA_KEYWORDS = ['data', 'entry', 'incorrect', 'wrong', 'error']
+
+
+def _trie_pattern(phrases):
+    """Regex matching any of phrases, shaped as a trie so it prefers the longest match at a position"""
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End of a phrase
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A phrase ending here makes the rest optional; greedy, so longer phrases win
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class PhraseMatcher:
+    """
+    Finds which of a fixed set of phrases occur in a text, in one pass
+    The phrases are compiled into one trie-shaped regex, which matches the longest
+    phrase starting at a position; the search resumes one character after each
+    match so overlapping phrases are found too. Any shorter phrase starting at the
+    same position is a prefix of the match, so those come from a table built up front
+    """
 
-    return cleaned
+    def __init__(self, phrases):
+        self.phrases = frozenset(phrases)
+        self.regex = re.compile(_trie_pattern(self.phrases))
+        self.prefixes = {
+            phrase: frozenset(other for other in self.phrases if phrase.startswith(other))
+            for phrase in self.phrases
+        }
+
+    def find(self, text, split=None):
+        """
+        (phrases found in text, those wholly before text[split], those wholly after it)
+        split is the index of a separator between two joined texts; without it the
+        last two sets are empty
+        """
+        found, before, after = set(), set(), set()
+        search = self.regex.search
+        match = search(text)
+        while match:
+            start, end = match.span()
+            phrases = self.prefixes[match.group()]
+            found |= phrases
+            if split is None:
+                pass
+            elif start > split:
+                after |= phrases
+            elif end <= split:
+                before |= phrases
+            else:
+                before.update(phrase for phrase in phrases if start + len(phrase) <= split)
+            match = search(text, start + 1)
+        return found, before, after
+
+
+# Everything categorize_issue() looks for in the full text; summary and description
+# hits are told apart by position, so those texts are never scanned separately
+FULL_TEXT_MATCHER = PhraseMatcher(
+    CLEANUP_PHRASES + HEADER_PHRASES + POLICY_PHRASES + SSR_PHRASES + ACCOUNT_PHRASES
+    + HEADER_NEGATIVE_KEYWORDS + POLICY_MISSING_KEYWORDS + SSR_NEGATIVE_KEYWORDS
+    + PRODUCER_KEYWORDS + PREMIUM_KEYWORDS + DATA_KEYWORDS
+    + ['account', 'policy', 'remove', 'delete', 'header', 'policy header', 'ssr', 'producer',
+       'endorsement', 'endorse', 'renewal', 'renew', 'not migrate', 'did not migrate']
+)
+
+# What is looked for in the text with metadata stripped
+CLEANED_TEXT_MATCHER = PhraseMatcher(ACCOUNT_PHRASES + ACCOUNT_MISSING_KEYWORDS + ['policy', 'account', 'client'])
 
 
 def categorize_issue(summary, description):
@@ -50,8 +282,8 @@ def categorize_issue(summary, description):
     desc_text = (description or '').lower()
     full_text = summary_text + ' ' + desc_text
 
-    # Create a cleaned version without metadata for more accurate matching
-    cleaned_text = strip_metadata(full_text)
+    # One scan collects every phrase below; the rules then only test set membership
+    found, in_summary, in_desc = FULL_TEXT_MATCHER.find(full_text, split=len(summary_text))
 
     # ============================================================================
     # PHASE 1: Check for HIGHLY SPECIFIC PHRASES (98% confidence)
@@ -60,103 +292,37 @@ def categorize_issue(summary, description):
     # ============================================================================
 
     # Account Cleanup/Removal - CHECK FIRST (most specific administrative action)
-    cleanup_specific_phrases = [
-        'please remove',
-        'delete account',
-        'remove account',
-        'delete this account',
-        'cleanup',
-        'migration cleanup',
-        'remove from 2.0',
-        'remove from epic'
-    ]
-    for phrase in cleanup_specific_phrases:
-        if phrase in full_text and ('account' in full_text or 'policy' in full_text):
-            return ('Account Cleanup/Removal', 98)  # Very high confidence
+    if not found.isdisjoint(CLEANUP_PHRASES) and ('account' in found or 'policy' in found):
+        return ('Account Cleanup/Removal', 98)  # Very high confidence
 
     # Policy Header specific phrases - CHECK BEFORE generic policy
-    header_specific_phrases = [
-        'header not created',
-        'header not in epic',
-        'header not showing',
-        'header not available',
-        'policy header not created',
-        'policy header not in epic',
-        'header missing',
-        'case issue# header',  # Common pattern
-        'case issue: header',
-        'case issue :header'
-    ]
-    for phrase in header_specific_phrases:
-        if phrase in full_text:
-            return ('Missing Policy Header', 98)  # Very high confidence
+    if not found.isdisjoint(HEADER_PHRASES):
+        return ('Missing Policy Header', 98)  # Very high confidence
 
     # Policy specific phrases (NOT header, NOT cleanup)
     # IMPORTANT: Check these FIRST before falling back to keyword-based header detection
-    policy_specific_phrases = [
-        'policy is not in epic',
-        'policy not in epic',
-        'policy is not available',
-        'policy not available',
-        'policy not created',
-        'policy not showing',
-        'policy missing',
-        'policy not found',
-        'policy is missing',
-        'policy did not migrate'
-    ]
-
-    # First, check if ANY policy-specific phrase exists (highest priority)
-    for phrase in policy_specific_phrases:
-        if phrase in full_text:
-            # Found a policy-specific phrase!
-            # Only skip if the SUMMARY explicitly mentions "header" (not just in metadata)
-            if 'header' in summary_text or 'case issue# header' in full_text or 'case issue: header' in full_text:
-                # This is actually about a header, skip to header logic
-                break
-            # Not about cleanup?
-            if 'remove' not in full_text and 'delete' not in full_text:
-                return ('Missing Policy', 98)  # Very high confidence
-
-    # Policy type patterns: "[Type] policy is not in epic"
-    policy_type_pattern = r'(worker[s]?\s+compensation|commercial\s+property|general\s+liability|auto|umbrella|liability|property|casualty|workers?\s+comp|wc|gl|comb\s+spec\s+ins)\s+policy\s+(is\s+)?(not\s+in\s+epic|missing|not\s+available|not\s+showing)'
-    if re.search(policy_type_pattern, full_text, re.IGNORECASE):
+    if not found.isdisjoint(POLICY_PHRASES):
+        # Only skip if the SUMMARY explicitly mentions "header" (not just in metadata)
+        about_header = 'header' in in_summary or 'case issue# header' in found or 'case issue: header' in found
+        # Not about cleanup?
+        if not about_header and 'remove' not in found and 'delete' not in found:
+            return ('Missing Policy', 98)  # Very high confidence
+
+    policy_type_pattern = POLICY_TYPE_PATTERN if full_text.isascii() else POLICY_TYPE_PATTERN_IGNORECASE
+    if policy_type_pattern.search(full_text):
         # Only skip if explicitly about header in the SUMMARY
-        if 'header' not in summary_text and 'case issue# header' not in full_text:
+        if 'header' not in in_summary and 'case issue# header' not in found:
             return ('Missing Policy', 98)  # Very high confidence - specific policy type missing
 
     # SSR specific phrases
-    ssr_specific_phrases = [
-        'ssr not created',
-        'ssr not in epic',
-        'ssr not showing',
-        'ssr not available',
-        'ssr missing',
-        'ssr not visible',
-        'ssr is not'
-    ]
-    for phrase in ssr_specific_phrases:
-        if phrase in full_text:
-            return ('Missing SSR', 98)  # Very high confidence
+    if not found.isdisjoint(SSR_PHRASES):
+        return ('Missing SSR', 98)  # Very high confidence
 
     # Account/Client specific phrases - BE SPECIFIC (not metadata)
-    # Use cleaned_text to avoid matching metadata like "Account Name: XYZ"
-    account_specific_phrases = [
-        'account not created',
-        'account not in epic',
-        'account missing',
-        'account is not available',
-        'account not available',
-        'client not in epic',
-        'client missing',
-        'client not found',
-        'account not found',
-        'unable to find given clients',
-        'need a 2.0 account'
-    ]
-    for phrase in account_specific_phrases:
-        if phrase in cleaned_text or phrase in full_text:
-            return ('Account/Client Missing', 98)  # Very high confidence
+    # Use the cleaned text to avoid matching metadata like "Account Name: XYZ"
+    cleaned = CLEANED_TEXT_MATCHER.find(strip_metadata(full_text))[0]
+    if not cleaned.isdisjoint(ACCOUNT_PHRASES) or not found.isdisjoint(ACCOUNT_PHRASES):
+        return ('Account/Client Missing', 98)  # Very high confidence
 
     # ============================================================================
     # PHASE 2: Check for KEYWORDS with STRONG CONTEXT (90-95% confidence)
@@ -165,55 +331,39 @@ def categorize_issue(summary, description):
     # ============================================================================
 
     # Policy Header - check in summary or as explicit mention
-    if 'header' in summary_text or 'policy header' in full_text:
+    if 'header' in in_summary or 'policy header' in found:
         # Strong negative indicators
-        negative_keywords = ['not', 'missing', 'incorrect', 'issue', 'not in epic',
-                            'not updated', 'not created', 'not showing', 'error',
-                            'unavailable', 'not available', 'not visible', 'is not']
-        if any(keyword in full_text for keyword in negative_keywords):
+        if not found.isdisjoint(HEADER_NEGATIVE_KEYWORDS):
             return ('Missing Policy Header', 95)  # High confidence
         return ('Missing Policy Header', 75)  # Medium-high confidence
 
     # Policy Missing - check BEFORE Account (more specific)
-    if 'policy' in summary_text or 'policy' in cleaned_text:
-        if 'header' not in full_text:  # Exclude header cases
-            policy_missing_keywords = ['missing', 'not available', 'not in epic',
-                                      'not showing', 'not found', 'not visible',
-                                      'not created', 'is not', 'not migrate',
-                                      'did not migrate', 'never set up']
-            if any(keyword in full_text for keyword in policy_missing_keywords):
+    if 'policy' in in_summary or 'policy' in cleaned:
+        if 'header' not in found:  # Exclude header cases
+            if not found.isdisjoint(POLICY_MISSING_KEYWORDS):
                 return ('Missing Policy', 90)  # High confidence
 
     # Account/Client Missing - check in cleaned text (exclude metadata mentions)
     # Only match if it's the SUBJECT of the issue, not just mentioned in metadata
-    if 'account' in cleaned_text or 'client' in cleaned_text:
+    if 'account' in cleaned or 'client' in cleaned:
         # Strong indicators this is about a missing account
-        account_missing_keywords = ['missing', 'not found', 'not available', 'not showing',
-                                   'not in epic', 'not visible', 'not created', 'locate',
-                                   'unable to find', 'cannot find', 'need']
-        if any(keyword in cleaned_text for keyword in account_missing_keywords):
+        if not cleaned.isdisjoint(ACCOUNT_MISSING_KEYWORDS):
             return ('Account/Client Missing', 90)  # High confidence
 
     # SSR issues
-    if 'ssr' in summary_text or 'ssr' in desc_text:
+    if 'ssr' in in_summary or 'ssr' in in_desc:
         # Strong negative indicators
-        negative_keywords = ['not', 'missing', 'unavailable', 'issue', 'not in epic',
-                            'not available', 'not created', 'not showing', 'not visible',
-                            'is not', 'error']
-        if any(keyword in full_text for keyword in negative_keywords):
+        if not found.isdisjoint(SSR_NEGATIVE_KEYWORDS):
             return ('Missing SSR', 95)  # High confidence
         return ('Missing SSR', 70)  # Medium confidence
 
     # Producer Updates
-    if 'producer' in summary_text or 'producer' in desc_text:
-        producer_keywords = ['update', 'change', 'incorrect', 'wrong',
-                           'not reflecting', 'not updated', 'needs update']
-        if any(keyword in full_text for keyword in producer_keywords):
+    if 'producer' in in_summary or 'producer' in in_desc:
+        if not found.isdisjoint(PRODUCER_KEYWORDS):
             return ('Producer Updates', 85)  # High confidence
 
     # Endorsement Issues
-    if ('endorsement' in summary_text or 'endorse' in summary_text or
-        'endorsement' in desc_text or 'endorse' in desc_text):
+    if 'endorse' in in_summary or 'endorse' in in_desc:  # Also covers "endorsement"
         return ('Endorsement Issues', 90)  # High confidence
 
     # ============================================================================
@@ -222,15 +372,12 @@ def categorize_issue(summary, description):
     # ============================================================================
 
     # Premium/Data Entry Issues
-    premium_keywords = ['premium', 'data entry', 'data error', 'incorrect premium',
-                       'wrong premium', 'amount', 'calculation', 'commission',
-                       'accounting', 'invoice', 'billing']
-    if any(keyword in full_text for keyword in premium_keywords):
+    if not found.isdisjoint(PREMIUM_KEYWORDS):
         return ('Premium/Data Entry Issues', 80)  # Medium-high confidence
 
     # Renewal issues (could be endorsement or data entry)
-    if 'renewal' in full_text or 'renew' in full_text:
-        if 'not migrate' in full_text or 'did not migrate' in full_text:
+    if 'renew' in found:  # Also covers "renewal"
+        if 'not migrate' in found:  # Also covers "did not migrate"
             return ('Missing Policy', 75)  # Likely a missing renewal policy
         return ('Premium/Data Entry Issues', 70)  # General renewal issue
 
@@ -239,8 +386,7 @@ def categorize_issue(summary, description):
     # Generic data-related keywords
     # ============================================================================
 
-    data_keywords = ['data', 'entry', 'incorrect', 'wrong', 'error']
-    if any(keyword in full_text for keyword in data_keywords):
+    if not found.isdisjoint(DATA_KEYWORDS):
         return ('Premium/Data Entry Issues', 55)  # Low confidence - weak match
 
     # ============================================================================
@@ -249,3 +395,90 @@ def categorize_issue(summary, description):
     # ============================================================================
 
     return ('Premium/Data Entry Issues', 40)  # Low confidence - default fallback
+
+
+def _categorize_chunk(chunk):
+    """Worker-side: categorize a list of (summary, description) pairs"""
+    return [categorize_issue(summary, description) for summary, description in chunk]
+
+
+def categorize_many(issues, workers=None, chunk_size=None):
+    """
+    Categorize many issues, spreading chunks over a pool of worker processes.
+
+    Args:
+        issues (iterable): (summary, description) pairs, as taken by categorize_issue()
+        workers (int): Worker processes, default CATEGORIZE_WORKERS; 1 categorizes in-process
+        chunk_size (int): Issues per chunk, default CATEGORIZE_CHUNK_SIZE
+
+    Returns:
+        list: (category_name, confidence_score) per issue, in the order given
+    """
+    issues = list(issues)
+    workers = workers or CATEGORIZE_WORKERS
+    chunk_size = chunk_size or CATEGORIZE_CHUNK_SIZE
+    chunks = [issues[i:i + chunk_size] for i in range(0, len(issues), chunk_size)]
+    workers = min(workers, len(chunks))
+
+    start = time.perf_counter()
+    if workers <= 1:
+        results = _categorize_chunk(issues)
+    else:
+        # Forking is cheapest, but a process forked while other threads hold locks can
+        # deadlock, so callers with threads running (the API) spawn fresh interpreters
+        context = multiprocessing.get_context('fork' if threading.active_count() == 1 else 'spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            results = [result for chunk in pool.map(_categorize_chunk, chunks) for result in chunk]
+    elapsed = time.perf_counter() - start
+
+    if len(issues) > chunk_size:
+        rate = len(issues) / elapsed if elapsed > 0 else 0
+        print(f"[{datetime.now()}] Categorized {len(issues)} issues in {elapsed:.2f}s "
+              f"({rate:,.0f} issues/sec, {max(workers, 1)} worker(s))", flush=True)
+    return results
+
+
+def text_hash(summary, description):
+    """Hash of what categorize_issue() reads from an issue: its lowercased summary and description"""
+    summary_text = (summary or '').lower()
+    desc_text = (description or '').lower()
+    text = f"{len(summary_text)}:{summary_text}{desc_text}"
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+
+def categorize_changed(issues, stored, workers=None, chunk_size=None):
+    """
+    Categorize only the issues whose text or rules changed since they were last categorized.
+
+    Args:
+        issues (iterable): (issue_key, summary, description) triples
+        stored (dict): issue_key -> (text_hash, rules_version, category, confidence, manual_category)
+            as last stored; issues missing from it are categorized
+        workers, chunk_size: As for categorize_many()
+
+    Returns:
+        list: Per issue, in order, the category, confidence, text_hash and rules_version to
+        store; for issues with a manual override, just their stored category and confidence
+    """
+    issues = list(issues)
+    results = [None] * len(issues)
+    changed = []
+    for i, (issue_key, summary, description) in enumerate(issues):
+        previous = stored.get(issue_key)
+        if previous and previous[4] is not None:
+            # Pinned by hand: nothing to compute
+            results[i] = {'category': previous[2], 'confidence': previous[3]}
+            continue
+        digest = text_hash(summary, description)
+        if previous and previous[:2] == (digest, RULES_VERSION) and previous[2] is not None:
+            category, confidence = previous[2:4]
+            results[i] = {'category': category, 'confidence': confidence, 'text_hash': digest,
+                          'rules_version': RULES_VERSION}
+        else:
+            results[i] = {'text_hash': digest, 'rules_version': RULES_VERSION}
+            changed.append(i)
+
+    categorized = categorize_many([issues[i][1:] for i in changed], workers, chunk_size)
+    for i, (category, confidence) in zip(changed, categorized):
+        results[i] = {'category': category, 'confidence': confidence, **results[i]}
+    return results
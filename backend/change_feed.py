@@ -0,0 +1,105 @@
+"""
+Server-Sent Events feed of data changes
+One poller per process watches the data version row (so commits from any process
+are seen) and fans change summaries out to every connected client
+"""
+import asyncio
+import orjson
+from starlette.concurrency import run_in_threadpool
+
+# How often the shared poller checks the data version while anyone is listening
+POLL_INTERVAL = 2.0
+
+# Comment line sent when nothing happens, so proxies don't drop idle streams
+KEEPALIVE_INTERVAL = 25.0
+
+
+def merge_events(events):
+    """Fold consecutive change summaries into one compact summary"""
+    counts = {}
+    keys = []
+    for event in events:
+        for kind, count in event.get('counts', {}).items():
+            counts[kind] = counts.get(kind, 0) + count
+        keys.extend(event.get('keys', []))
+    return {'counts': counts, 'keys': list(dict.fromkeys(keys))[:50]}
+
+
+def format_event(version, payload, event='data-version'):
+    """One SSE message"""
+    return f"event: {event}\nid: {version}\ndata: ".encode() + orjson.dumps(payload) + b"\n\n"
+
+
+class ChangeFeed:
+    """Polls the database for new data versions and broadcasts them to subscribers"""
+
+    def __init__(self, get_db, poll_interval=POLL_INTERVAL, on_version=None):
+        self.get_db = get_db
+        self.poll_interval = poll_interval
+        # Called with every (version, updated_at) read, e.g. to pass other processes' commits to the response cache
+        self.on_version = on_version
+        self.subscribers = set()
+        self.version = None
+        self.task = None
+
+    async def current_version(self):
+        version, updated_at = await run_in_threadpool(self.get_db().get_data_version)
+        if self.on_version:
+            self.on_version(version, updated_at)
+        return version
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=100)
+        self.subscribers.add(queue)
+        # Only poll while someone is listening
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    async def run(self):
+        if self.version is None:
+            self.version = await self.current_version()
+
+        while self.subscribers:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                version = await self.current_version()
+                if version == self.version:
+                    continue
+                events = await run_in_threadpool(self.get_db().get_change_events, self.version)
+            except Exception as e:
+                print(f"Change feed poll failed: {str(e)}")
+                continue
+
+            payload = {'version': version, 'previous': self.version, **merge_events(events)}
+            self.version = version
+            message = format_event(version, payload)
+            for queue in list(self.subscribers):
+                try:
+                    queue.put_nowait(message)
+                except asyncio.QueueFull:
+                    # Slow client; it will catch up from the version in a later event
+                    pass
+
+    async def stream(self, request, last_event_id=None):
+        """Async generator of SSE bytes for one client"""
+        queue = self.subscribe()
+        try:
+            # Tell the client where things stand, including anything it missed while disconnected
+            version = await self.current_version()
+            payload = {'version': version, 'previous': last_event_id, 'counts': {}, 'keys': []}
+            if last_event_id is not None and last_event_id < version:
+                events = await run_in_threadpool(self.get_db().get_change_events, last_event_id)
+                payload.update(merge_events(events))
+            yield b"retry: 5000\n" + format_event(version, payload)
+
+            while not await request.is_disconnected():
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            self.unsubscribe(queue)
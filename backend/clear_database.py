@@ -3,41 +3,29 @@ Clear all issues from the database
 Run this on production to reset the database before full refresh
 """
 import os
-from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
+from database import Database, Issue
 
 load_dotenv()
 
-def clear_database():
-    """Clear all issues from the database"""
-    database_url = os.getenv('DATABASE_URL')
+def clear_database(db=None):
+    """Clear all live issues from the database (the one DATABASE_URL points at unless db is given)"""
+    if db is None:
+        if not os.getenv('DATABASE_URL'):
+            print("ERROR: DATABASE_URL environment variable not set")
+            return
 
-    if not database_url:
-        print("ERROR: DATABASE_URL environment variable not set")
-        return
+        print(f"Connecting to database...")
+        db = Database()
 
-    # Render uses postgres:// but SQLAlchemy needs postgresql://
-    if database_url.startswith('postgres://'):
-        database_url = database_url.replace('postgres://', 'postgresql://', 1)
+    print(f"Found {db.session.query(Issue).count()} issues in database")
 
-    print(f"Connecting to database...")
-    engine = create_engine(database_url)
-
-    with engine.connect() as conn:
-        # Count before delete
-        result = conn.execute(text("SELECT COUNT(*) FROM issues"))
-        count_before = result.fetchone()[0]
-        print(f"Found {count_before} issues in database")
-
-        # Delete all issues
-        print("Deleting all issues...")
-        conn.execute(text("DELETE FROM issues"))
-        conn.commit()
-
-        # Count after delete
-        result = conn.execute(text("SELECT COUNT(*) FROM issues"))
-        count_after = result.fetchone()[0]
-        print(f"✅ Database cleared! Issues remaining: {count_after}")
+    # One commit: rows, descriptions, search text and rollups go together, every deleted
+    # key gets a tombstone for delta sync clients, and the data version moves on so
+    # cached responses are dropped
+    print("Deleting all issues...")
+    deleted = db.clear_issues()
+    print(f"✅ Database cleared! Deleted {deleted} issues, {db.session.query(Issue).count()} remaining")
 
     print("\n" + "="*80)
     print("Database cleared successfully!")
@@ -0,0 +1,85 @@
+"""
+Negotiated gzip/brotli compression for JSON API responses
+Streaming responses (exports, event streams) and small bodies are passed through untouched
+"""
+import gzip
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; fall back to gzip only
+    brotli = None
+
+# Bodies smaller than this are not worth the CPU or the extra headers
+MINIMUM_SIZE = 1024
+
+# Per-request compression favours speed; cached variants are compressed once
+# per data version, so they can afford a higher level
+DYNAMIC_LEVELS = {'br': 4, 'gzip': 5}
+CACHED_LEVELS = {'br': 7, 'gzip': 9}
+
+COMPRESSIBLE_TYPES = ('application/json',)
+
+
+def supported_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(accept_encoding):
+    """Pick the best encoding the client accepts, or None for identity"""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+
+    candidates = [
+        (accepted.get(encoding, accepted.get('*', 0.0)), -index, encoding)
+        for index, encoding in enumerate(supported_encodings())
+    ]
+    quality, _, encoding = max(candidates)
+    return encoding if quality > 0 else None
+
+
+def compress(body, encoding, levels=DYNAMIC_LEVELS):
+    if encoding == 'br':
+        return brotli.compress(body, quality=levels['br'])
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=levels['gzip'], mtime=0)
+    return body
+
+
+def is_compressible(headers):
+    content_type = headers.get('content-type', '')
+    return 'content-encoding' not in headers and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def install(app):
+    """Compress JSON responses that were not already encoded further in (e.g. by the response cache)"""
+
+    @app.middleware("http")
+    async def compression_middleware(request: Request, call_next):
+        response = await call_next(request)
+        if not is_compressible(response.headers):
+            return response
+
+        encoding = negotiate(request.headers.get('accept-encoding'))
+        body = b''.join([chunk async for chunk in response.body_iterator])
+        headers = dict(response.headers)
+        headers['vary'] = 'Accept-Encoding'
+
+        if encoding is not None and len(body) >= MINIMUM_SIZE:
+            body = compress(body, encoding)
+            headers['content-encoding'] = encoding
+        headers['content-length'] = str(len(body))
+
+        return Response(content=body, status_code=response.status_code, headers=headers)
@@ -5,7 +5,7 @@ import csv
 from datetime import datetime
 import os
 from dotenv import load_dotenv
-from categorizer import categorize_issue
+from categorizer import categorize_changed
 from database import Database
 
 load_dotenv()
@@ -43,12 +43,20 @@ class CSVImporter:
         skipped_count = 0
 
         with open(self.csv_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
+            rows = list(csv.DictReader(csvfile))
+
+            # Categorize every row at once, skipping issues whose text and rules are unchanged
+            texts = [
+                ((row.get('Issue key') or '').strip(), (row.get('Summary') or '').strip(),
+                 (row.get('Description') or '').strip())
+                for row in rows
+            ]
+            categorized = categorize_changed(texts, self.db.get_categorization_state(key for key, _, _ in texts))
 
             batch = []
             batch_size = 50
 
-            for row in reader:
+            for row, categorization in zip(rows, categorized):
                 try:
                     issue_key = row.get('Issue key', '').strip()
                     if not issue_key:
@@ -58,9 +66,6 @@ class CSVImporter:
                     summary = row.get('Summary', '').strip()
                     description = row.get('Description', '').strip()
 
-                    # Categorize the issue
-                    category = categorize_issue(summary, description)
-
                     # Parse dates
                     created_date = self.parse_date(row.get('Created', ''))
                     updated_date = self.parse_date(row.get('Updated', ''))
@@ -69,10 +74,10 @@ class CSVImporter:
                     db_issue_data = {
                         'issue_key': issue_key,
                         'summary': summary[:500] if summary else '',
-                        'description': description[:5000] if description else '',
+                        'description': description,
                         'status': row.get('Status', 'Unknown').strip(),
                         'priority': row.get('Priority', 'None').strip(),
-                        'category': category,
+                        **categorization,
                         'created_date': created_date,
                         'updated_date': updated_date,
                         'assignee': row.get('Assignee', 'Unassigned').strip() or 'Unassigned',
@@ -1,22 +1,119 @@
 """
 Database models and operations for EPIC issues dashboard
 """
-from sqlalchemy import create_engine, Column, String, Integer, DateTime, Float, Text
+from sqlalchemy import (
+    create_engine, event, Column, String, Integer, DateTime, Float, Text, LargeBinary, Index, func, inspect, literal, select, text
+)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from datetime import datetime
+from sqlalchemy.orm import Session, sessionmaker, relationship, selectinload, foreign
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+import json
 import os
+import re
+import zlib
 
 Base = declarative_base()
 
+# Statuses that mean an issue is finished and will not change again
+CLOSED_STATUSES = ('Done', 'Closed', 'Resolved', "Won't Do", 'Cancelled', 'Canceled')
 
-class Issue(Base):
-    """Issue model for storing Jira issues"""
-    __tablename__ = 'issues'
+# Closed issues untouched for longer than this are moved to the archive tier
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', 180))
+
+# How long per-commit change summaries are kept for clients catching up
+CHANGE_EVENT_RETENTION_DAYS = int(os.getenv('CHANGE_EVENT_RETENTION_DAYS', 7))
+
+# Issue keys kept per change summary; counts are always complete
+CHANGE_SAMPLE_KEYS = 50
+
+# How long deleted issues are remembered for delta sync (/issues/changes)
+TOMBSTONE_RETENTION_DAYS = int(os.getenv('TOMBSTONE_RETENTION_DAYS', 30))
+
+# How long finished job runs stay visible at /jobs/{id}
+JOB_RUN_RETENTION_DAYS = 7
+
+# Columns added after the first release; created on startup if an older database lacks them
+SYNC_COLUMNS = [
+    ('issues', 'row_version'),
+    ('issues', 'created_version'),
+    ('issues_archive', 'row_version'),
+    ('issues_archive', 'created_version'),
+    ('data_version', 'sync_horizon'),
+]
+
+# What an issue's automatic category was computed from (see categorizer.text_hash and
+# RULES_VERSION; NULL means "recategorize") and the manual override pinning it, if any;
+# added on startup if missing
+CATEGORIZATION_COLUMNS = [
+    ('issues', 'text_hash', 'VARCHAR'),
+    ('issues', 'rules_version', 'INTEGER'),
+    ('issues', 'manual_category', 'VARCHAR'),
+    ('issues_archive', 'text_hash', 'VARCHAR'),
+    ('issues_archive', 'rules_version', 'INTEGER'),
+    ('issues_archive', 'manual_category', 'VARCHAR'),
+]
+
+# Called as listener(version, updated_at) after every commit made by any Database in
+# this process, e.g. to keep an in-process copy of the data version current
+COMMIT_LISTENERS = []
+
+# Fields ingest writes from the categorizer, left alone on issues with a manual override
+CATEGORIZATION_FIELDS = ('category', 'confidence', 'text_hash', 'rules_version')
+
+# Full-text search index DDL. Both dialects keep searchable text in an
+# `issue_search` side table that upsert_issue writes alongside the issue;
+# SQLite indexes it with an external-content FTS5 table kept in sync by
+# triggers, PostgreSQL with a generated tsvector column and a GIN index.
+SQLITE_SEARCH_DDL = [
+    """CREATE TABLE IF NOT EXISTS issue_search (
+        id INTEGER PRIMARY KEY,
+        issue_key TEXT NOT NULL UNIQUE,
+        summary TEXT,
+        description TEXT
+    )""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(
+        summary, description,
+        content='issue_search', content_rowid='id',
+        tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS issue_search_ai AFTER INSERT ON issue_search BEGIN
+        INSERT INTO issues_fts(rowid, summary, description)
+        VALUES (new.id, new.summary, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS issue_search_ad AFTER DELETE ON issue_search BEGIN
+        INSERT INTO issues_fts(issues_fts, rowid, summary, description)
+        VALUES ('delete', old.id, old.summary, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS issue_search_au AFTER UPDATE ON issue_search BEGIN
+        INSERT INTO issues_fts(issues_fts, rowid, summary, description)
+        VALUES ('delete', old.id, old.summary, old.description);
+        INSERT INTO issues_fts(rowid, summary, description)
+        VALUES (new.id, new.summary, new.description);
+    END""",
+]
+
+POSTGRES_SEARCH_DDL = [
+    """CREATE TABLE IF NOT EXISTS issue_search (
+        issue_key VARCHAR PRIMARY KEY,
+        summary TEXT,
+        description TEXT,
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(summary, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_issue_search_document ON issue_search USING GIN (document)",
+]
+
+
+class IssueFields:
+    """Columns shared by live issues and archived issues"""
 
     issue_key = Column(String, primary_key=True)
     summary = Column(Text)
-    description = Column(Text)
     status = Column(String)
     priority = Column(String)
     category = Column(String)
@@ -26,6 +123,207 @@ class Issue(Base):
     assignee = Column(String)
     reporter = Column(String)
     last_fetched = Column(DateTime, default=datetime.utcnow)
+    # Data versions of the commits that last changed and first inserted the issue
+    row_version = Column(Integer, default=0, index=True)
+    created_version = Column(Integer, default=0)
+    # Hash of the text and the rules version the category was computed from
+    text_hash = Column(String)
+    rules_version = Column(Integer)
+    # Category set by hand (PATCH /issues); while set, it is the category and ingest
+    # and recategorization leave the issue's category alone
+    manual_category = Column(String)
+
+
+class Issue(IssueFields, Base):
+    """Issue model for storing Jira issues"""
+    __tablename__ = 'issues'
+
+    # Full description lives compressed in issue_descriptions and is only
+    # loaded when something reads issue.description
+    description_record = relationship(
+        'IssueDescription',
+        primaryjoin='Issue.issue_key == foreign(IssueDescription.issue_key)',
+        uselist=False, lazy='select', cascade='all, delete-orphan'
+    )
+
+    @property
+    def description(self):
+        """Full description text, decompressed on access"""
+        record = self.description_record
+        return record.text if record else None
+
+    @description.setter
+    def description(self, value):
+        if value is None:
+            self.description_record = None
+        elif self.description_record is None:
+            self.description_record = IssueDescription(text=value)
+        else:
+            self.description_record.text = value
+
+
+class IssueDescription(Base):
+    """Full issue description, zlib-compressed and stored out of line from the issues table"""
+    __tablename__ = 'issue_descriptions'
+
+    # No foreign key: the description stays put when its issue moves to the archive
+    issue_key = Column(String, primary_key=True)
+    body = Column(LargeBinary)
+    length = Column(Integer)  # Uncompressed length in characters
+
+    def __init__(self, text=None, **kwargs):
+        super().__init__(**kwargs)
+        if text is not None:
+            self.text = text
+
+    @property
+    def text(self):
+        """Decompressed description"""
+        return zlib.decompress(self.body).decode('utf-8') if self.body is not None else None
+
+    @text.setter
+    def text(self, value):
+        value = str(value)
+        self.body = zlib.compress(value.encode('utf-8'), 6)
+        self.length = len(value)
+
+
+class ArchivedIssue(IssueFields, Base):
+    """Long-closed issue moved out of the hot issues table"""
+    __tablename__ = 'issues_archive'
+
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ArchiveRollup(Base):
+    """Frozen issue counts for the archive, one row per dimension combination"""
+    __tablename__ = 'archive_rollups'
+
+    id = Column(Integer, primary_key=True)
+    category = Column(String)
+    status = Column(String)
+    priority = Column(String)
+    assignee = Column(String)
+    created_week = Column(DateTime)  # Monday 00:00 of the week the issue was created
+    count = Column(Integer, default=0)
+
+    DIMENSIONS = ('category', 'status', 'priority', 'assignee', 'created_week')
+
+
+class IssueRollup(Base):
+    """
+    Live issue counts per dimension combination, kept in step with the issues table:
+    the flush hook turns every insert, delete and dimension change into cell deltas
+    that commit() applies. A cell may be split over several rows; always SUM(count)
+    """
+    __tablename__ = 'issue_rollups'
+
+    id = Column(Integer, primary_key=True)
+    category = Column(String)
+    status = Column(String)
+    priority = Column(String)
+    assignee = Column(String)
+    created_week = Column(DateTime)
+    count = Column(Integer, default=0)
+
+    DIMENSIONS = ArchiveRollup.DIMENSIONS
+    __table_args__ = (Index('ix_issue_rollups_cell', *DIMENSIONS),)
+
+
+# Issue columns that decide an issue's rollup cell
+ROLLUP_SOURCE_COLUMNS = ('category', 'status', 'priority', 'assignee', 'created_date')
+
+# Names accepted by aggregate_issues(), and the rollup column each one reads
+AGGREGATE_DIMENSIONS = {
+    'category': 'category',
+    'status': 'status',
+    'priority': 'priority',
+    'assignee': 'assignee',
+    'week': 'created_week',
+}
+
+# Overwriting one of these loads its previous value first, so the flush hook can
+# take the issue out of its old rollup cell even if the attribute wasn't loaded
+for _name in ROLLUP_SOURCE_COLUMNS:
+    event.listen(getattr(Issue, _name), 'set', lambda target, value, oldvalue, initiator: None, active_history=True)
+
+
+def to_naive_utc(value):
+    """value as a naive UTC datetime; aware values (Jira dates carry an offset) are converted, naive ones kept"""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def start_of_week(value):
+    """Monday 00:00 (UTC) of the week containing value"""
+    if value is None:
+        return None
+    value = to_naive_utc(value)
+    return (value - timedelta(days=value.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def rollup_cell(row):
+    """(category, status, priority, assignee, created_week) of a mapping of issue columns"""
+    return (row['category'], row['status'], row['priority'], row['assignee'], start_of_week(row['created_date']))
+
+
+class DataVersion(Base):
+    """Single-row counter bumped by every commit, used to invalidate cached responses"""
+    __tablename__ = 'data_version'
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    # Oldest version a delta sync can start from; tombstones before it have been pruned
+    sync_horizon = Column(Integer, default=0)
+
+
+class ChangeEvent(Base):
+    """Compact summary of what one commit changed, keyed by the data version it produced"""
+    __tablename__ = 'change_events'
+
+    version = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    summary = Column(Text)  # JSON: {"counts": {kind: n}, "keys": [...]}
+
+
+class IssueTombstone(Base):
+    """Marker left behind by a deleted issue so delta sync clients can drop it too"""
+    __tablename__ = 'issue_tombstones'
+
+    issue_key = Column(String, primary_key=True)
+    row_version = Column(Integer, default=0, index=True)
+    deleted_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class JobLease(Base):
+    """Who may run a background job right now, and how its last run went (shared by all workers)"""
+    __tablename__ = 'job_leases'
+
+    job_id = Column(String, primary_key=True)
+    holder = Column(String)  # host:pid of the worker holding (or that last held) the lease
+    expires_at = Column(DateTime)  # NULL once released
+    last_started_at = Column(DateTime)
+    last_finished_at = Column(DateTime)
+    last_status = Column(String)  # running, succeeded or failed
+    last_error = Column(Text)
+
+
+class JobRun(Base):
+    """One requested run of a background job; requests that were merged into it share its row"""
+    __tablename__ = 'job_runs'
+
+    id = Column(String, primary_key=True)
+    job_type = Column(String, index=True)  # refresh or full_reload
+    state = Column(String)  # queued, running, succeeded, failed or skipped
+    requests = Column(Integer, default=1)  # how many requests this run answers
+    worker = Column(String)
+    requested_at = Column(DateTime, default=datetime.utcnow, index=True)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    counts = Column(Text)  # JSON, e.g. {"fetched": 12}
+    error = Column(Text)
 
 
 class DashboardStats(Base):
@@ -58,18 +356,239 @@ class Database:
             # Fall back to SQLite for local development
             self.engine = create_engine(f'sqlite:///{db_path}')
             print(f"Using SQLite database: {db_path}")
+            # WAL lets snapshot readers and the ingest writer proceed without blocking each other
+            with self.engine.connect() as conn:
+                conn.exec_driver_sql('PRAGMA journal_mode=WAL')
 
         Base.metadata.create_all(self.engine)
         Session = sessionmaker(bind=self.engine)
         self.session = Session()
+        # Issue keys touched since the last commit, by kind of change
+        self.pending_changes = {}
+        # Issues flushed since the last commit, so commit() can stamp their row versions
+        self.changed_keys = set()
+        self.created_keys = set()
+        # Pending issue_rollups changes, rollup cell -> count delta
+        self.rollup_deltas = Counter()
+        event.listen(self.session, 'before_flush', self._track_changed_issues)
+
+        self._ensure_sync_columns()
+        self._ensure_categorization_columns()
+        self._migrate_inline_descriptions()
+        self._ensure_search_index()
+        self._ensure_data_version()
+        self._ensure_issue_rollups()
+
+    def _ensure_data_version(self):
+        """Create the data version row if this is a fresh database"""
+        if self.session.get(DataVersion, 1) is None:
+            self.session.add(DataVersion(id=1, version=0, updated_at=datetime.utcnow()))
+            try:
+                self.session.commit()
+            except IntegrityError:
+                # Another process created it first
+                self.session.rollback()
+
+    def _ensure_sync_columns(self):
+        """Add the delta sync version columns to tables created before they existed"""
+        inspector = inspect(self.engine)
+        existing = {table: {c['name'] for c in inspector.get_columns(table)} for table, _ in SYNC_COLUMNS}
+        missing = [(table, column) for table, column in SYNC_COLUMNS if column not in existing[table]]
+        if not missing:
+            return
+
+        with self.engine.begin() as conn:
+            for table, column in missing:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER DEFAULT 0"))
+            for table in ('issues', 'issues_archive'):
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_row_version ON {table} (row_version)"))
+        print(f"Added delta sync columns: {', '.join(f'{t}.{c}' for t, c in missing)}")
+
+    def _ensure_categorization_columns(self):
+        """Add the text hash and rules version columns to tables created before they existed"""
+        inspector = inspect(self.engine)
+        existing = {table: {c['name'] for c in inspector.get_columns(table)} for table, _, _ in CATEGORIZATION_COLUMNS}
+        missing = [(table, column, kind) for table, column, kind in CATEGORIZATION_COLUMNS
+                   if column not in existing[table]]
+        if not missing:
+            return
+
+        with self.engine.begin() as conn:
+            for table, column, kind in missing:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {kind}"))
+        print(f"Added categorization columns: {', '.join(f'{t}.{c}' for t, c, _ in missing)}")
+
+    def _ensure_issue_rollups(self):
+        """Build the live rollups for a database whose issues predate them, or rebuild them if they went negative"""
+        with self.engine.begin() as conn:
+            # Lock the version row first so concurrently starting workers can't both build them
+            conn.execute(DataVersion.__table__.update().where(DataVersion.id == 1).values(version=DataVersion.version))
+            if conn.execute(select(IssueRollup.id).limit(1)).first() is not None:
+                if conn.execute(select(IssueRollup.id).where(IssueRollup.count < 0).limit(1)).first() is None:
+                    return
+                # Negative cells mean deltas were keyed inconsistently (aware dates bucketed
+                # without converting to UTC, before ingest normalized them); recount
+                conn.execute(IssueRollup.__table__.delete())
+            counts = self._count_issue_cells(conn)
+            if counts:
+                conn.execute(IssueRollup.__table__.insert(), [
+                    {**dict(zip(IssueRollup.DIMENSIONS, cell)), 'count': count} for cell, count in counts.items()
+                ])
+                print(f"Built {len(counts)} issue rollup cells")
+
+    @staticmethod
+    def _count_issue_cells(conn):
+        columns = [getattr(Issue, name) for name in ROLLUP_SOURCE_COLUMNS]
+        return Counter(rollup_cell(r._mapping) for r in conn.execute(select(*columns)))
+
+    def rebuild_issue_rollups(self):
+        """Recount the live rollups from the issues table, after writes that bypassed them (caller commits)"""
+        self.session.flush()
+        self.rollup_deltas.clear()
+        self.session.execute(IssueRollup.__table__.delete())
+        counts = self._count_issue_cells(self.session)
+        if counts:
+            self.session.execute(IssueRollup.__table__.insert(), [
+                {**dict(zip(IssueRollup.DIMENSIONS, cell)), 'count': count} for cell, count in counts.items()
+            ])
+
+    def count_in_rollups(self, row, delta):
+        """Move delta issues into row's live rollup cell, for writes that bypass the ORM (applied on commit)"""
+        self.rollup_deltas[rollup_cell(row)] += delta
+
+    def _track_changed_issues(self, session, flush_context, instances):
+        """before_flush hook: remember which issues this transaction wrote and how the rollups change"""
+        for obj in session.new:
+            if isinstance(obj, Issue):
+                self.changed_keys.add(obj.issue_key)
+                if not obj.created_version:
+                    self.created_keys.add(obj.issue_key)
+                self.rollup_deltas[rollup_cell({name: getattr(obj, name) for name in ROLLUP_SOURCE_COLUMNS})] += 1
+        for obj in session.dirty:
+            if isinstance(obj, (Issue, IssueDescription)) and session.is_modified(obj):
+                self.changed_keys.add(obj.issue_key)
+                if isinstance(obj, Issue):
+                    old, new = self._previous_rollup_cell(obj), rollup_cell(
+                        {name: getattr(obj, name) for name in ROLLUP_SOURCE_COLUMNS}
+                    )
+                    if old != new:
+                        self.rollup_deltas[old] -= 1
+                        self.rollup_deltas[new] += 1
+        for obj in session.deleted:
+            if isinstance(obj, Issue):
+                self.rollup_deltas[self._previous_rollup_cell(obj)] -= 1
+
+    @staticmethod
+    def _previous_rollup_cell(issue):
+        """Rollup cell of an issue as last flushed, before this flush's changes"""
+        state = inspect(issue)
+        values = {}
+        for name in ROLLUP_SOURCE_COLUMNS:
+            history = state.attrs[name].history
+            if history.added or history.deleted:
+                values[name] = history.deleted[0] if history.deleted else None
+            else:
+                values[name] = getattr(issue, name)
+        return rollup_cell(values)
+
+    def _apply_rollup_deltas(self):
+        """Add the pending deltas to issue_rollups with atomic increments, so concurrent writers don't lose counts"""
+        emptied = False
+        for cell, delta in self.rollup_deltas.items():
+            if delta == 0:
+                continue
+            condition = [getattr(IssueRollup, d).is_not_distinct_from(v) for d, v in zip(IssueRollup.DIMENSIONS, cell)]
+            row_id = self.session.execute(select(IssueRollup.id).where(*condition).limit(1)).scalar()
+            updated = row_id is not None and self.session.execute(
+                IssueRollup.__table__.update().where(IssueRollup.id == row_id).values(count=IssueRollup.count + delta)
+            ).rowcount == 1
+            if not updated:
+                # A concurrent insert of the same cell just splits it over two rows
+                self.session.execute(IssueRollup.__table__.insert().values(
+                    **dict(zip(IssueRollup.DIMENSIONS, cell)), count=delta
+                ))
+            emptied = emptied or delta < 0
+        if emptied:
+            self.session.execute(IssueRollup.__table__.delete().where(IssueRollup.count == 0))
+
+    def _migrate_inline_descriptions(self):
+        """Move descriptions from the legacy issues.description column into issue_descriptions"""
+        columns = [c['name'] for c in inspect(self.engine).get_columns('issues')]
+        if 'description' not in columns:
+            return
+
+        with self.engine.begin() as conn:
+            rows = conn.execute(text("""
+                SELECT i.issue_key, i.description FROM issues i
+                WHERE i.description IS NOT NULL
+                AND NOT EXISTS (SELECT 1 FROM issue_descriptions d WHERE d.issue_key = i.issue_key)
+            """)).all()
+            if not rows:
+                return
+
+            records = [IssueDescription(issue_key=r.issue_key, text=r.description) for r in rows]
+            conn.execute(IssueDescription.__table__.insert(), [
+                {'issue_key': r.issue_key, 'body': r.body, 'length': r.length} for r in records
+            ])
+            conn.execute(text("UPDATE issues SET description = NULL WHERE description IS NOT NULL"))
+            print(f"Moved {len(records)} descriptions to compressed storage")
+
+    def _ensure_search_index(self):
+        """Create the full-text search index and backfill it if it is empty"""
+        ddl = POSTGRES_SEARCH_DDL if self.engine.dialect.name == 'postgresql' else SQLITE_SEARCH_DDL
+        with self.engine.begin() as conn:
+            for statement in ddl:
+                conn.execute(text(statement))
+
+            indexed = conn.execute(text("SELECT COUNT(*) FROM issue_search")).scalar()
+            if indexed:
+                return
+
+            rows = conn.execute(
+                select(Issue.issue_key, Issue.summary, IssueDescription.body)
+                .outerjoin(IssueDescription, IssueDescription.issue_key == Issue.issue_key)
+            ).all()
+            if rows:
+                conn.execute(text("""
+                    INSERT INTO issue_search (issue_key, summary, description)
+                    VALUES (:issue_key, :summary, :description)
+                """), [
+                    {
+                        'issue_key': r.issue_key,
+                        'summary': r.summary,
+                        'description': IssueDescription(body=r.body).text
+                    }
+                    for r in rows
+                ])
+
+    def _index_issue(self, issue, description):
+        """Write an issue's searchable text to the search index (same transaction)"""
+        self.session.execute(text("""
+            INSERT INTO issue_search (issue_key, summary, description)
+            VALUES (:issue_key, :summary, :description)
+            ON CONFLICT (issue_key) DO UPDATE
+            SET summary = excluded.summary, description = excluded.description
+        """), {
+            'issue_key': issue.issue_key,
+            'summary': issue.summary,
+            'description': description
+        })
 
     def upsert_issue(self, issue_data, commit=True):
         """Insert or update an issue"""
+        # Dates are stored as naive UTC, so the stored value and the rollup week computed
+        # from the incoming one agree on every database
+        issue_data = {
+            key: to_naive_utc(value) if isinstance(value, datetime) else value for key, value in issue_data.items()
+        }
         issue = self.session.query(Issue).filter_by(
             issue_key=issue_data['issue_key']
-        ).first()
+        ).first() or self.restore_archived_issue(issue_data['issue_key'])
 
         if issue:
+            if issue.manual_category is not None:
+                # A manual override pins the category
+                issue_data = {key: value for key, value in issue_data.items() if key not in CATEGORIZATION_FIELDS}
             # Update existing issue
             for key, value in issue_data.items():
                 setattr(issue, key, value)
@@ -80,18 +599,526 @@ class Database:
 
         issue.last_fetched = datetime.utcnow()
 
+        if 'summary' in issue_data or 'description' in issue_data:
+            description = issue_data['description'] if 'description' in issue_data else issue.description
+            self._index_issue(issue, description)
+            if 'text_hash' not in issue_data and issue.manual_category is None:
+                # Whatever the stored hash described may have changed; the next pass recategorizes
+                issue.text_hash = None
+
+        self.note_change('upserted', issue.issue_key)
+
         if commit:
-            self.session.commit()
+            self.commit()
 
         return issue
 
+    def note_change(self, kind, issue_key):
+        """Record that issue_key changed, for the summary written by the next commit"""
+        self.pending_changes.setdefault(kind, []).append(issue_key)
+
     def commit(self):
-        """Commit pending changes"""
+        """Commit pending changes, bump the data version and log a change summary, all in one transaction"""
+        now = datetime.utcnow()
+        self.session.execute(
+            DataVersion.__table__.update()
+            .where(DataVersion.id == 1)
+            .values(version=DataVersion.version + 1, updated_at=now)
+        )
+        version = self.session.execute(select(DataVersion.version).where(DataVersion.id == 1)).scalar()
+
+        keys = [key for kind_keys in self.pending_changes.values() for key in kind_keys]
+        self._stamp_row_versions(version, keys)
+        self._apply_rollup_deltas()
+
+        summary = {
+            'counts': {kind: len(kind_keys) for kind, kind_keys in self.pending_changes.items()},
+            'keys': list(dict.fromkeys(keys))[:CHANGE_SAMPLE_KEYS]
+        }
+        self.session.add(ChangeEvent(version=version, created_at=now, summary=json.dumps(summary)))
+        if version % 100 == 0:
+            self.session.query(ChangeEvent).filter(
+                ChangeEvent.created_at < now - timedelta(days=CHANGE_EVENT_RETENTION_DAYS)
+            ).delete(synchronize_session=False)
+            self._prune_tombstones(now - timedelta(days=TOMBSTONE_RETENTION_DAYS))
+
         self.session.commit()
+        self._clear_pending()
+        for listener in COMMIT_LISTENERS:
+            listener(version, now)
+
+    def rollback(self):
+        """Discard pending changes"""
+        self.session.rollback()
+        self._clear_pending()
+
+    def _clear_pending(self):
+        self.pending_changes = {}
+        self.changed_keys = set()
+        self.created_keys = set()
+        self.rollup_deltas = Counter()
+
+    def _stamp_row_versions(self, version, noted_keys):
+        """Set row_version (and created_version for new issues) on everything this commit touched"""
+        # The version bump above autoflushed, so the flush hook has seen every ORM write
+        keys = list(self.changed_keys.union(noted_keys))
+        created_keys = list(self.created_keys)
+        # Chunked to stay under SQLite's bound-parameter limit
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            for table in (Issue.__table__, ArchivedIssue.__table__, IssueTombstone.__table__):
+                self.session.execute(
+                    table.update().where(table.c.issue_key.in_(chunk)).values(row_version=version)
+                )
+        for i in range(0, len(created_keys), 500):
+            chunk = created_keys[i:i + 500]
+            self.session.execute(
+                Issue.__table__.update().where(Issue.issue_key.in_(chunk)).values(created_version=version)
+            )
+            # A key that comes back after being deleted is no longer deleted
+            self.session.execute(
+                IssueTombstone.__table__.delete().where(IssueTombstone.issue_key.in_(chunk))
+            )
+
+    def _prune_tombstones(self, cutoff):
+        """Forget deletions older than cutoff and move the delta sync horizon past them"""
+        pruned_through = self.session.query(func.max(IssueTombstone.row_version)).filter(
+            IssueTombstone.deleted_at < cutoff
+        ).scalar()
+        if pruned_through is None:
+            return
+        self.session.query(IssueTombstone).filter(
+            IssueTombstone.deleted_at < cutoff
+        ).delete(synchronize_session=False)
+        self.session.execute(
+            DataVersion.__table__.update()
+            .where(DataVersion.id == 1, func.coalesce(DataVersion.sync_horizon, 0) < pruned_through)
+            .values(sync_horizon=pruned_through)
+        )
+
+    def get_change_events(self, since_version, limit=500):
+        """Change summaries committed after since_version, oldest first"""
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(ChangeEvent.version, ChangeEvent.created_at, ChangeEvent.summary)
+                .where(ChangeEvent.version > since_version)
+                .order_by(ChangeEvent.version)
+                .limit(limit)
+            ).all()
+        return [
+            {'version': r.version, 'created_at': r.created_at, **json.loads(r.summary or '{}')}
+            for r in rows
+        ]
+
+    @contextmanager
+    def snapshot(self):
+        """Yield a read-only Database view where every query sees the same committed state"""
+        with self.engine.connect() as conn:
+            if self.engine.dialect.name == 'postgresql':
+                conn = conn.execution_options(isolation_level='REPEATABLE READ')
+            else:
+                # pysqlite only opens transactions for writes; start one so reads share a snapshot
+                conn.exec_driver_sql('BEGIN')
+
+            view = Database.__new__(Database)
+            view.engine = self.engine
+            view.session = Session(bind=conn)
+            view._clear_pending()
+            try:
+                yield view
+            finally:
+                view.session.close()
+                conn.rollback()
+
+    def read_data_version(self):
+        """(version, updated_at) as seen by this session, e.g. inside a snapshot"""
+        row = self.session.execute(
+            select(DataVersion.version, DataVersion.updated_at).where(DataVersion.id == 1)
+        ).first()
+        return (row.version, row.updated_at) if row else (0, None)
 
-    def get_all_issues(self):
-        """Get all issues"""
-        return self.session.query(Issue).all()
+    def get_data_version(self):
+        """Current (version, updated_at), read on a fresh connection so other writers are visible"""
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(DataVersion.version, DataVersion.updated_at).where(DataVersion.id == 1)
+            ).first()
+        return (row.version, row.updated_at) if row else (0, None)
+
+    def try_acquire_lease(self, job_id, holder, lease_seconds, min_interval_seconds=0):
+        """
+        Take the lease for job_id if nobody holds an unexpired one and the job didn't start
+        within min_interval_seconds. Runs in its own transaction; True if acquired
+        """
+        try:
+            with self.engine.begin() as conn:
+                if conn.execute(select(JobLease.job_id).where(JobLease.job_id == job_id)).first() is None:
+                    conn.execute(JobLease.__table__.insert().values(job_id=job_id))
+        except IntegrityError:
+            pass  # Another worker created the row first
+
+        now = datetime.utcnow()
+        with self.engine.begin() as conn:
+            # One conditional UPDATE, so two workers can't both win
+            condition = (JobLease.job_id == job_id) & (
+                JobLease.expires_at.is_(None) | (JobLease.expires_at < now)
+            )
+            if min_interval_seconds:
+                condition &= JobLease.last_started_at.is_(None) | (
+                    JobLease.last_started_at < now - timedelta(seconds=min_interval_seconds)
+                )
+            result = conn.execute(
+                JobLease.__table__.update().where(condition).values(
+                    holder=holder, expires_at=now + timedelta(seconds=lease_seconds),
+                    last_started_at=now, last_status='running', last_error=None
+                )
+            )
+            return result.rowcount == 1
+
+    def renew_lease(self, job_id, holder, lease_seconds):
+        """Extend a lease we hold; False if it was lost (expired and taken by another worker)"""
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                JobLease.__table__.update()
+                .where(JobLease.job_id == job_id, JobLease.holder == holder, JobLease.expires_at.isnot(None))
+                .values(expires_at=datetime.utcnow() + timedelta(seconds=lease_seconds))
+            )
+            return result.rowcount == 1
+
+    def release_lease(self, job_id, holder, status, error=None):
+        """Give up a lease and record how the run ended"""
+        with self.engine.begin() as conn:
+            conn.execute(
+                JobLease.__table__.update()
+                .where(JobLease.job_id == job_id, JobLease.holder == holder)
+                .values(expires_at=None, last_finished_at=datetime.utcnow(), last_status=status, last_error=error)
+            )
+
+    def get_job_leases(self):
+        """Lease and last-run state of every job, as seen by all workers"""
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(JobLease).order_by(JobLease.job_id)).mappings().all()
+        return [dict(row) for row in rows]
+
+    def create_job_run(self, run_id, job_type, worker):
+        """Record a newly requested run and drop finished runs older than JOB_RUN_RETENTION_DAYS"""
+        now = datetime.utcnow()
+        with self.engine.begin() as conn:
+            conn.execute(JobRun.__table__.delete().where(
+                JobRun.requested_at < now - timedelta(days=JOB_RUN_RETENTION_DAYS),
+                JobRun.state.notin_(('queued', 'running'))
+            ))
+            conn.execute(JobRun.__table__.insert().values(
+                id=run_id, job_type=job_type, state='queued', requests=1, worker=worker, requested_at=now
+            ))
+
+    def add_job_run_request(self, run_id):
+        """Count one more request answered by a queued run"""
+        with self.engine.begin() as conn:
+            conn.execute(
+                JobRun.__table__.update().where(JobRun.id == run_id).values(requests=JobRun.requests + 1)
+            )
+
+    def update_job_run(self, run_id, **values):
+        """Set state, timestamps, counts (a dict) or error of a run"""
+        if 'counts' in values:
+            values['counts'] = json.dumps(values['counts'])
+        with self.engine.begin() as conn:
+            conn.execute(JobRun.__table__.update().where(JobRun.id == run_id).values(**values))
+
+    def get_job_run(self, run_id):
+        """A run as a dict, or None"""
+        with self.engine.connect() as conn:
+            row = conn.execute(select(JobRun).where(JobRun.id == run_id)).mappings().first()
+        if row is None:
+            return None
+        run = dict(row)
+        run['counts'] = json.loads(run['counts']) if run['counts'] else {}
+        return run
+
+    def get_all_issues(self, with_descriptions=False):
+        """Get all issues (descriptions are loaded lazily unless requested up front)"""
+        query = self.session.query(Issue)
+        if with_descriptions:
+            query = query.options(selectinload(Issue.description_record))
+        return query.all()
+
+    def get_categorization_state(self, issue_keys):
+        """
+        issue_key -> (text_hash, rules_version, category, confidence, manual_category) of
+        stored issues, live or archived
+        """
+        keys = list(issue_keys)
+        state = {}
+        for model in (ArchivedIssue, Issue):
+            for i in range(0, len(keys), 500):
+                for row in self.session.execute(
+                    select(
+                        model.issue_key, model.text_hash, model.rules_version, model.category, model.confidence,
+                        model.manual_category
+                    ).where(model.issue_key.in_(keys[i:i + 500]))
+                ):
+                    state[row.issue_key] = tuple(row[1:])
+        return state
+
+    def get_issue(self, issue_key, include_archived=False):
+        """Get a single issue by key, optionally falling back to the archive"""
+        issue = self.session.query(Issue).filter_by(issue_key=issue_key).first()
+        if issue is None and include_archived:
+            issue = self.session.get(ArchivedIssue, issue_key)
+        return issue
+
+    def get_archived_issues(self):
+        """Get all archived issues"""
+        return self.session.query(ArchivedIssue).all()
+
+    def get_description(self, issue_key):
+        """Get the full description of any issue, live or archived"""
+        record = self.session.get(IssueDescription, issue_key)
+        return record.text if record else None
+
+    def count_issues(self):
+        """Total number of issues across the hot table and the archive"""
+        hot = self.session.query(func.count(Issue.issue_key)).scalar() or 0
+        archived = self.session.query(func.sum(ArchiveRollup.count)).scalar() or 0
+        return hot + archived
+
+    def archive_closed_issues(self, older_than_days=ARCHIVE_AFTER_DAYS):
+        """Move issues closed for longer than older_than_days into the archive tier"""
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        issues = self.session.query(Issue).filter(
+            Issue.status.in_(CLOSED_STATUSES),
+            func.coalesce(Issue.updated_date, Issue.created_date) < cutoff
+        ).all()
+        if not issues:
+            return 0
+
+        columns = [c.name for c in Issue.__table__.columns]
+        rows = [{name: getattr(issue, name) for name in columns} for issue in issues]
+        keys = [row['issue_key'] for row in rows]
+
+        rollups = {
+            tuple(getattr(r, d) for d in ArchiveRollup.DIMENSIONS): r
+            for r in self.session.query(ArchiveRollup).all()
+        }
+        for row in rows:
+            self._adjust_rollup(rollups, row, 1)
+            # The bulk delete below bypasses the flush hook
+            self.count_in_rollups(row, -1)
+            self.note_change('archived', row['issue_key'])
+
+        now = datetime.utcnow()
+        self.session.execute(ArchivedIssue.__table__.insert(), [{**row, 'archived_at': now} for row in rows])
+        # Delete in chunks to stay under SQLite's bound-parameter limit. Bulk
+        # delete skips the ORM cascade, so descriptions stay in place.
+        for i in range(0, len(keys), 500):
+            self.session.query(Issue).filter(
+                Issue.issue_key.in_(keys[i:i + 500])
+            ).delete(synchronize_session=False)
+
+        self.commit()
+        self.session.expire_all()
+        return len(rows)
+
+    def restore_archived_issue(self, issue_key):
+        """Move an archived issue back into the hot table (e.g. it was reopened or edited)"""
+        row = self._remove_from_archive(issue_key)
+        if row is None:
+            return None
+        self.note_change('restored', issue_key)
+
+        issue = Issue(**row)
+        # Attach the existing description so writes update it instead of inserting a duplicate
+        issue.description_record = self.session.get(IssueDescription, issue_key)
+        self.session.add(issue)
+        return issue
+
+    def override_categories(self, overrides):
+        """
+        Manually set categories for many issues at once (caller commits)
+        overrides maps issue_key -> category; returns issue_key -> Issue, or None if not found
+        """
+        keys = list(overrides)
+        found = {}
+        for i in range(0, len(keys), 500):
+            for issue in self.session.query(Issue).filter(Issue.issue_key.in_(keys[i:i + 500])):
+                found[issue.issue_key] = issue
+
+        missing = [key for key in keys if key not in found]
+        for i in range(0, len(missing), 500):
+            archived = self.session.query(ArchivedIssue.issue_key).filter(
+                ArchivedIssue.issue_key.in_(missing[i:i + 500])
+            ).all()
+            for (key,) in archived:
+                # Edited issues move back to the hot table
+                found[key] = self.restore_archived_issue(key)
+
+        for key, issue in found.items():
+            self.pin_category(issue, overrides[key])
+
+        return {key: found.get(key) for key in keys}
+
+    def pin_category(self, issue, category):
+        """Manually set an issue's category; ingest and recategorization keep it until unpinned (caller commits)"""
+        issue.manual_category = category
+        issue.category = category
+        issue.confidence = 100.0
+        self.note_change('overridden', issue.issue_key)
+
+    def unpin_category(self, issue, categorization):
+        """
+        Drop an issue's manual override, storing its automatic categorization instead (caller commits)
+        categorization is what categorizer.categorize_changed() returns for the issue
+        """
+        issue.manual_category = None
+        for key, value in categorization.items():
+            setattr(issue, key, value)
+        self.note_change('overridden', issue.issue_key)
+
+    def _remove_from_archive(self, issue_key):
+        """Delete an archived issue and take it out of the rollups; returns its columns, or None"""
+        archived = self.session.get(ArchivedIssue, issue_key)
+        if archived is None:
+            return None
+
+        columns = [c.name for c in Issue.__table__.columns]
+        row = {name: getattr(archived, name) for name in columns}
+
+        rollups = {
+            tuple(getattr(r, d) for d in ArchiveRollup.DIMENSIONS): r
+            for r in self.session.query(ArchiveRollup).filter_by(
+                category=row['category'], status=row['status'], priority=row['priority'],
+                assignee=row['assignee'], created_week=start_of_week(row['created_date'])
+            )
+        }
+        self._adjust_rollup(rollups, row, -1)
+        self.session.delete(archived)
+        return row
+
+    def clear_issues(self, key_prefix='', include_archived=False):
+        """
+        Delete every live issue, or only those whose key starts with key_prefix, leaving
+        tombstones so delta sync clients drop them too; the archive is kept unless
+        include_archived. Commits and returns how many were deleted
+        """
+        pattern = f"{key_prefix}%"
+        tables = (Issue, ArchivedIssue) if include_archived else (Issue,)
+        keys = [
+            key for table in tables
+            for (key,) in self.session.query(table.issue_key).filter(table.issue_key.like(pattern))
+        ]
+        if not keys:
+            return 0
+
+        now = datetime.utcnow()
+        for table in tables:
+            matching = select(table.issue_key).where(table.issue_key.like(pattern))
+            self.session.query(IssueTombstone).filter(
+                IssueTombstone.issue_key.in_(matching)
+            ).delete(synchronize_session=False)
+            self.session.execute(IssueTombstone.__table__.insert().from_select(
+                ['issue_key', 'deleted_at'], select(table.issue_key, literal(now)).where(table.issue_key.like(pattern))
+            ))
+            # Descriptions and search text are keyed by issue_key; left behind, they would
+            # collide with the same keys when they are ingested again
+            self.session.query(IssueDescription).filter(
+                IssueDescription.issue_key.in_(matching)
+            ).delete(synchronize_session=False)
+            self.session.execute(text(
+                f"DELETE FROM issue_search WHERE issue_key IN "
+                f"(SELECT issue_key FROM {table.__tablename__} WHERE issue_key LIKE :pattern)"
+            ), {'pattern': pattern})
+
+        # Bulk deletes bypass the flush hook
+        if key_prefix:
+            columns = [getattr(Issue, name) for name in ROLLUP_SOURCE_COLUMNS]
+            for row in self.session.execute(select(*columns).where(Issue.issue_key.like(pattern))):
+                self.count_in_rollups(row._mapping, -1)
+        else:
+            # The live rollups count nothing but these issues
+            self.session.query(IssueRollup).delete(synchronize_session=False)
+        self.session.query(Issue).filter(Issue.issue_key.like(pattern)).delete(synchronize_session=False)
+
+        if include_archived:
+            rollups = {
+                tuple(getattr(r, d) for d in ArchiveRollup.DIMENSIONS): r
+                for r in self.session.query(ArchiveRollup).all()
+            }
+            columns = [getattr(ArchivedIssue, name) for name in ROLLUP_SOURCE_COLUMNS]
+            for row in self.session.execute(select(*columns).where(ArchivedIssue.issue_key.like(pattern))):
+                self._adjust_rollup(rollups, row._mapping, -1)
+            self.session.query(ArchivedIssue).filter(
+                ArchivedIssue.issue_key.like(pattern)
+            ).delete(synchronize_session=False)
+
+        for key in keys:
+            self.note_change('deleted', key)
+
+        self.commit()
+        self.session.expire_all()
+        return len(keys)
+
+    def get_changes(self, since_version):
+        """
+        Issues written and deleted after since_version, for delta sync
+        Returns None when since_version is older than the tombstone horizon (or newer than
+        the data), meaning the client has to reload everything
+        """
+        row = self.session.execute(
+            select(DataVersion.version, DataVersion.sync_horizon).where(DataVersion.id == 1)
+        ).first()
+        version, horizon = (row.version, row.sync_horizon or 0) if row else (0, 0)
+        if since_version < horizon or since_version > version:
+            return None
+
+        return {
+            'version': version,
+            'issues': self.session.query(Issue).filter(Issue.row_version > since_version).all(),
+            'archived': self.session.query(ArchivedIssue).filter(ArchivedIssue.row_version > since_version).all(),
+            'deleted': [
+                r.issue_key for r in
+                self.session.query(IssueTombstone.issue_key).filter(IssueTombstone.row_version > since_version)
+            ]
+        }
+
+    def _adjust_rollup(self, rollups, row, delta):
+        """Add delta to the archive rollup bucket for row, creating or dropping it as needed"""
+        key = rollup_cell(row)
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollup = ArchiveRollup(**dict(zip(ArchiveRollup.DIMENSIONS, key)), count=0)
+            self.session.add(rollup)
+            rollups[key] = rollup
+        rollup.count += delta
+        if rollup.count <= 0:
+            self.session.delete(rollup)
+            del rollups[key]
+
+    def _grouped_counts(self, *dimensions):
+        """Issue counts grouped by the given column names, from the live and archive rollups"""
+        return dict(self.aggregate_issues(dimensions))
+
+    def aggregate_issues(self, dimensions, filters=None, created_from=None, created_to=None):
+        """
+        Issue counts grouped by dimensions (keys of AGGREGATE_DIMENSIONS), summed over the
+        live and archive rollups, so the cost depends on the number of cells, not issues
+        filters maps dimension names to required values; created_from/created_to bound the
+        creation week (whole weeks: a week counts if it starts on or before created_to
+        and ends after created_from). Returns [(values, count)], largest first
+        """
+        counts = Counter()
+        for model in (IssueRollup, ArchiveRollup):
+            columns = [getattr(model, AGGREGATE_DIMENSIONS[d]) for d in dimensions]
+            query = self.session.query(*columns, func.sum(model.count))
+            for name, value in (filters or {}).items():
+                query = query.filter(getattr(model, AGGREGATE_DIMENSIONS[name]) == value)
+            if created_from is not None:
+                query = query.filter(model.created_week >= start_of_week(created_from))
+            if created_to is not None:
+                query = query.filter(model.created_week <= created_to)
+            for r in query.group_by(*columns):
+                counts[tuple(r[:-1])] += r[-1] or 0
+        return [(values, count) for values, count in counts.most_common() if count]
 
     def get_issues_by_category(self, category):
         """Get issues filtered by category"""
@@ -101,54 +1128,97 @@ class Database:
         """Get issues filtered by status"""
         return self.session.query(Issue).filter_by(status=status).all()
 
+    def search_issues(self, query, limit=50):
+        """Full-text search over summaries and descriptions, best matches first"""
+        # Reduce free text to plain terms so user input can't break the query syntax
+        terms = re.findall(r'\w+', query or '')
+        if not terms:
+            return []
+
+        # Matches may live in the hot table or the archive
+        columns = ', '.join(
+            f'coalesce(i.{c}, a.{c}) AS {c}'
+            for c in ('issue_key', 'summary', 'status', 'category', 'priority', 'confidence', 'created_date')
+        )
+
+        if self.engine.dialect.name == 'postgresql':
+            sql = text(f"""
+                SELECT {columns},
+                       ts_rank(s.document, q) AS rank,
+                       ts_headline('english', coalesce(s.description, '') || ' ' || coalesce(s.summary, ''), q,
+                                   'StartSel=<mark>, StopSel=</mark>, MaxWords=24, MinWords=8') AS snippet
+                FROM plainto_tsquery('english', :query) q, issue_search s
+                LEFT JOIN issues i ON i.issue_key = s.issue_key
+                LEFT JOIN issues_archive a ON a.issue_key = s.issue_key
+                WHERE s.document @@ q
+                AND (i.issue_key IS NOT NULL OR a.issue_key IS NOT NULL)
+                ORDER BY rank DESC
+                LIMIT :limit
+            """)
+            params = {'query': ' '.join(terms), 'limit': limit}
+        else:
+            # bm25() is lower-is-better; summary hits weigh more than description hits
+            sql = text(f"""
+                SELECT {columns},
+                       -bm25(issues_fts, 4.0, 1.0) AS rank,
+                       snippet(issues_fts, -1, '<mark>', '</mark>', '...', 24) AS snippet
+                FROM issues_fts
+                JOIN issue_search s ON s.id = issues_fts.rowid
+                LEFT JOIN issues i ON i.issue_key = s.issue_key
+                LEFT JOIN issues_archive a ON a.issue_key = s.issue_key
+                WHERE issues_fts MATCH :query
+                AND (i.issue_key IS NOT NULL OR a.issue_key IS NOT NULL)
+                ORDER BY rank DESC
+                LIMIT :limit
+            """)
+            params = {'query': ' '.join(f'"{term}"' for term in terms), 'limit': limit}
+
+        results = self.session.execute(sql.columns(created_date=DateTime), params).all()
+
+        return [
+            {
+                'issue_key': r.issue_key,
+                'summary': r.summary,
+                'status': r.status,
+                'category': r.category,
+                'priority': r.priority,
+                'confidence': r.confidence,
+                'created_date': r.created_date.isoformat() if r.created_date else None,
+                'rank': float(r.rank),
+                'snippet': r.snippet
+            }
+            for r in results
+        ]
+
     def get_category_stats(self):
         """Get statistics grouped by category"""
-        from sqlalchemy import func
+        counts = self._grouped_counts('category')
+        results = sorted(counts.items(), key=lambda item: item[1], reverse=True)
 
-        results = self.session.query(
-            Issue.category,
-            func.count(Issue.issue_key).label('count')
-        ).group_by(Issue.category).order_by(func.count(Issue.issue_key).desc()).all()
-
-        return [{'name': r.category, 'value': r.count} for r in results]
+        return [{'name': key[0], 'value': count} for key, count in results]
 
     def get_status_stats(self):
         """Get statistics grouped by status"""
-        from sqlalchemy import func
-
-        results = self.session.query(
-            Issue.status,
-            func.count(Issue.issue_key).label('count')
-        ).group_by(Issue.status).order_by(func.count(Issue.issue_key).desc()).all()
+        counts = self._grouped_counts('status')
+        results = sorted(counts.items(), key=lambda item: item[1], reverse=True)
 
-        return [{'name': r.status, 'value': r.count} for r in results]
+        return [{'name': key[0], 'value': count} for key, count in results]
 
     def get_priority_stats(self):
         """Get statistics grouped by priority"""
-        from sqlalchemy import func
-
-        results = self.session.query(
-            Issue.priority,
-            func.count(Issue.issue_key).label('count')
-        ).group_by(Issue.priority).all()
+        counts = self._grouped_counts('priority')
 
-        return [{'name': r.priority, 'value': r.count} for r in results]
+        return [{'name': key[0], 'value': count} for key, count in counts.items()]
 
     def get_category_details(self):
         """Get detailed breakdown by category and status"""
-        from sqlalchemy import func
-
-        results = self.session.query(
-            Issue.category,
-            Issue.status,
-            func.count(Issue.issue_key).label('count')
-        ).group_by(Issue.category, Issue.status).all()
+        counts = self._grouped_counts('category', 'status')
 
         # Organize data by category
         category_details = {}
-        for r in results:
-            if r.category not in category_details:
-                category_details[r.category] = {
+        for (category, status), count in counts.items():
+            if category not in category_details:
+                category_details[category] = {
                     'done': 0,
                     'inProgress': 0,
                     'backlog': 0,
@@ -156,16 +1226,16 @@ class Database:
                     'total': 0
                 }
 
-            if r.status == 'Done':
-                category_details[r.category]['done'] = r.count
-            elif r.status == 'In Progress':
-                category_details[r.category]['inProgress'] = r.count
-            elif r.status == 'Backlog':
-                category_details[r.category]['backlog'] = r.count
+            if status == 'Done':
+                category_details[category]['done'] = count
+            elif status == 'In Progress':
+                category_details[category]['inProgress'] = count
+            elif status == 'Backlog':
+                category_details[category]['backlog'] = count
             else:
-                category_details[r.category]['other'] += r.count
+                category_details[category]['other'] += count
 
-            category_details[r.category]['total'] += r.count
+            category_details[category]['total'] += count
 
         # Calculate completion rates
         for category in category_details:
@@ -209,6 +1279,15 @@ class Database:
 
         weeks.reverse()  # Oldest first
 
+        # Archived issues only contribute through their frozen weekly rollups
+        archived = {}
+        for r in self.session.query(
+            ArchiveRollup.category, ArchiveRollup.created_week, func.sum(ArchiveRollup.count)
+        ).filter(
+            ArchiveRollup.created_week >= weeks[0]['start']
+        ).group_by(ArchiveRollup.category, ArchiveRollup.created_week):
+            archived[(r[0], r[1])] = r[2]
+
         # Get total issues per week
         total_trend = []
         for week in weeks:
@@ -219,9 +1298,12 @@ class Database:
                 Issue.created_date >= week['start'],
                 Issue.created_date < end_date
             ).scalar()
+            count = (count or 0) + sum(
+                n for (_, created_week), n in archived.items() if created_week == week['start']
+            )
             total_trend.append({
                 'week': week['label'],
-                'count': count or 0,
+                'count': count,
                 'is_current': week.get('is_current', False)
             })
 
@@ -239,6 +1321,7 @@ class Database:
         # Get category trends
         category_trends = {}
         categories = [r.category for r in self.session.query(Issue.category).distinct()]
+        categories += sorted({c for c, _ in archived} - set(categories), key=str)
 
         for category in categories:
             category_data = []
@@ -251,9 +1334,10 @@ class Database:
                     Issue.created_date >= week['start'],
                     Issue.created_date < end_date
                 ).scalar()
+                count = (count or 0) + archived.get((category, week['start']), 0)
                 category_data.append({
                     'week': week['label'],
-                    'count': count or 0,
+                    'count': count,
                     'is_current': week.get('is_current', False)
                 })
 
@@ -0,0 +1,143 @@
+"""
+Columnar Parquet export of the issues table for offline analysis
+Streams rows out of the database in chunks, so memory stays bounded by the chunk size.
+Archived issues are included after the live ones unless include_archived is False
+"""
+import os
+import sys
+from datetime import datetime
+from dotenv import load_dotenv
+from sqlalchemy import select
+from database import Database, Issue, ArchivedIssue, IssueDescription
+
+load_dotenv()
+
+# Low-cardinality text columns are dictionary-encoded so each distinct value
+# is stored once per row group
+DICTIONARY_COLUMNS = {'status', 'priority', 'category', 'assignee', 'reporter'}
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def build_schema(include_description=False):
+    """Arrow schema for the exported issues table"""
+    import pyarrow as pa
+
+    dictionary_string = pa.dictionary(pa.int32(), pa.string())
+    fields = [
+        pa.field('issue_key', pa.string(), nullable=False),
+        pa.field('summary', pa.string()),
+        pa.field('status', dictionary_string),
+        pa.field('priority', dictionary_string),
+        pa.field('category', dictionary_string),
+        pa.field('confidence', pa.float64()),
+        pa.field('created_date', pa.timestamp('us')),
+        pa.field('updated_date', pa.timestamp('us')),
+        pa.field('assignee', dictionary_string),
+        pa.field('reporter', dictionary_string),
+        pa.field('last_fetched', pa.timestamp('us')),
+    ]
+    if include_description:
+        fields.append(pa.field('description', pa.string()))
+    return pa.schema(fields)
+
+
+def iter_record_batches(db, chunk_size=DEFAULT_CHUNK_SIZE, include_description=False, include_archived=True):
+    """Yield Arrow record batches of at most chunk_size issues, read with a server-side cursor, hot table first then archive"""
+    import pyarrow as pa
+
+    schema = build_schema(include_description)
+    tables = [Issue, ArchivedIssue] if include_archived else [Issue]
+
+    with db.engine.connect() as conn:
+        conn = conn.execution_options(stream_results=True, yield_per=chunk_size)
+        for table in tables:
+            columns = [getattr(table, name) for name in schema.names if name != 'description']
+            query = select(*columns).order_by(table.issue_key)
+            if include_description:
+                query = query.add_columns(IssueDescription.body).outerjoin(
+                    IssueDescription, IssueDescription.issue_key == table.issue_key
+                )
+
+            for rows in conn.execute(query).partitions(chunk_size):
+                arrays = []
+                for index, field in enumerate(schema):
+                    values = [row[index] for row in rows]
+                    if field.name == 'description':
+                        # Descriptions are stored compressed; decompress only when exported
+                        values = [IssueDescription(body=body).text for body in values]
+                        arrays.append(pa.array(values, type=field.type))
+                    elif field.name in DICTIONARY_COLUMNS:
+                        arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+                    else:
+                        arrays.append(pa.array(values, type=field.type))
+                yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_parquet_bytes(db, chunk_size=DEFAULT_CHUNK_SIZE, include_description=False, include_archived=True):
+    """Yield a Parquet file as byte chunks, one row group per database chunk"""
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, build_schema(include_description), compression='zstd')
+    try:
+        for batch in iter_record_batches(db, chunk_size, include_description, include_archived):
+            writer.write_batch(batch)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_issues(output_path, chunk_size=DEFAULT_CHUNK_SIZE, include_description=False, db=None,
+                  include_archived=True):
+    """Write the issues table to a Parquet file and return the number of rows written"""
+    import pyarrow.parquet as pq
+
+    db = db or Database(os.getenv('DATABASE_PATH', './issues.db'))
+    rows = 0
+    with pq.ParquetWriter(output_path, build_schema(include_description), compression='zstd') as writer:
+        for batch in iter_record_batches(db, chunk_size, include_description, include_archived):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+if __name__ == '__main__':
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    output_path = args[0] if args else f"issues-{datetime.utcnow().strftime('%Y-%m-%d')}.parquet"
+    include_description = '--with-description' in sys.argv
+    include_archived = '--without-archived' not in sys.argv
+
+    print(f"Exporting issues to {output_path}...")
+    count = export_issues(output_path, include_description=include_description, include_archived=include_archived)
+    print(f"✅ Exported {count} issues ({os.path.getsize(output_path)} bytes)")
@@ -0,0 +1,70 @@
+"""
+Streaming NDJSON and CSV exports of issues
+Rows come off a server-side cursor and are written out a chunk at a time, so memory
+use does not grow with the size of the export
+"""
+import csv
+import io
+import orjson
+from sqlalchemy import select
+from database import Issue, ArchivedIssue, IssueDescription
+
+EXPORT_FIELDS = [
+    'issue_key', 'summary', 'status', 'category', 'confidence', 'priority',
+    'assignee', 'reporter', 'created_date', 'updated_date'
+]
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def iter_issue_rows(db, include_description=False, include_archived=True,
+                    category=None, status=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield lists of issue dicts, at most chunk_size at a time, hot table first then archive"""
+    tables = [Issue, ArchivedIssue] if include_archived else [Issue]
+
+    with db.engine.connect() as conn:
+        conn = conn.execution_options(stream_results=True, yield_per=chunk_size)
+        for table in tables:
+            query = select(*[getattr(table, name) for name in EXPORT_FIELDS]).order_by(table.issue_key)
+            if category:
+                query = query.where(table.category == category)
+            if status:
+                query = query.where(table.status == status)
+            if include_description:
+                query = query.add_columns(IssueDescription.body).outerjoin(
+                    IssueDescription, IssueDescription.issue_key == table.issue_key
+                )
+
+            for rows in conn.execute(query).partitions(chunk_size):
+                chunk = []
+                for row in rows:
+                    item = dict(zip(EXPORT_FIELDS, row))
+                    if include_description:
+                        item['description'] = IssueDescription(body=row[-1]).text
+                    chunk.append(item)
+                yield chunk
+
+
+def iter_ndjson(db, **filters):
+    """Yield newline-delimited JSON, one issue per line"""
+    for chunk in iter_issue_rows(db, **filters):
+        yield b''.join(orjson.dumps(item) + b'\n' for item in chunk)
+
+
+def iter_csv(db, include_description=False, **filters):
+    """Yield CSV text, starting with the header row"""
+    fields = EXPORT_FIELDS + (['description'] if include_description else [])
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+
+    writer.writeheader()
+    yield buffer.getvalue().encode('utf-8')
+
+    for chunk in iter_issue_rows(db, include_description=include_description, **filters):
+        buffer.seek(0)
+        buffer.truncate()
+        for item in chunk:
+            for name in ('created_date', 'updated_date'):
+                if item[name] is not None:
+                    item[name] = item[name].isoformat()
+            writer.writerow(item)
+        yield buffer.getvalue().encode('utf-8')
@@ -0,0 +1,234 @@
+"""
+Fill the database with realistic synthetic issues for load and performance testing
+Summaries and descriptions use the phrasing typical of each category, statuses and
+priorities follow the mix seen in the real project, and created dates spread over
+the last two years with fewer tickets at weekends.
+
+Usage: python generate_synthetic_data.py 100000 [--seed 42] [--reset]
+Writes to DATABASE_URL if set, otherwise DATABASE_PATH / ./issues.db. Synthetic
+issues use the SYN- key prefix; --reset deletes existing SYN- issues first.
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from sqlalchemy import select, text
+from categorizer import categorize_issue
+from database import Database, DataVersion, Issue, ArchivedIssue, IssueDescription
+
+load_dotenv()
+
+KEY_PREFIX = 'SYN'
+CHUNK_SIZE = 5000
+DAYS_SPREAD = 730
+
+# Share of tickets per category, and the summaries/descriptions reporters write for them
+CATEGORY_TEMPLATES = {
+    'Missing SSR': (0.18, [
+        'SSR not in EPIC for {account}',
+        'SSR missing - {account} {policy_type} renewal',
+        'Case Issue: SSR not showing for {account}',
+        'SSR not created after bind for {account}',
+    ], [
+        'The SSR for this account is not available in EPIC. Please create it so the team can service the renewal.',
+        'We bound the {policy_type} policy last week but the SSR is not visible on the account.',
+    ]),
+    'Missing Policy Header': (0.16, [
+        'Policy header not in EPIC - {account}',
+        'Case Issue# Header not created {policy_number}',
+        'Header missing for {policy_type} policy',
+        'Policy header not showing for {account}',
+    ], [
+        'The policy header was not created when the policy was migrated. Producer cannot see the term.',
+        'Header missing on the {policy_type} policy for the {term} term.',
+    ]),
+    'Missing Policy': (0.2, [
+        '{policy_type} policy is not in EPIC',
+        'Policy not found for {account}',
+        'Policy did not migrate - {policy_number}',
+        'Renewal policy missing for {account}',
+    ], [
+        'The {policy_type} policy is not available in EPIC after the migration. Please add it.',
+        'Could not find policy {policy_number} anywhere in 2.0.',
+    ]),
+    'Account/Client Missing': (0.12, [
+        'Account not in EPIC - {account}',
+        'Client missing for {account}',
+        'Unable to find given clients in EPIC',
+        'Need a 2.0 account for {account}',
+    ], [
+        'The account was not created in EPIC so we cannot attach the policy.',
+        'Client not found when searching by name or lookup code.',
+    ]),
+    'Producer Updates': (0.08, [
+        'Producer update needed for {account}',
+        'Wrong producer on {account}',
+        'Producer change not reflecting in EPIC',
+    ], [
+        'Please update the producer on this account to {person}; the current one is incorrect.',
+        'Producer change was submitted but is not updated on the policy.',
+    ]),
+    'Endorsement Issues': (0.08, [
+        'Endorsement not processed for {policy_number}',
+        'Endorse {policy_type} policy - additional insured',
+        'Endorsement missing on {account}',
+    ], [
+        'The endorsement adding an additional insured has not been applied.',
+        'Please endorse the policy to update the mailing address.',
+    ]),
+    'Premium/Data Entry Issues': (0.14, [
+        'Incorrect premium on {policy_number}',
+        'Data entry error - {account}',
+        'Commission amount wrong for {account}',
+        'Invoice does not match premium',
+    ], [
+        'The premium shown in EPIC does not match the carrier invoice of ${amount}.',
+        'Data error on the policy: the billing amount is wrong.',
+    ]),
+    'Account Cleanup/Removal': (0.04, [
+        'Please remove account {account}',
+        'Delete account - duplicate of {account}',
+        'Migration cleanup for {account}',
+    ], [
+        'This account is a duplicate created by the migration, please remove it from EPIC.',
+        'Cleanup: delete this account, policies were moved to the main record.',
+    ]),
+}
+
+STATUSES = [('Done', 0.55), ('Backlog', 0.18), ('In Progress', 0.1), ('Waiting for support', 0.09),
+            ('Closed', 0.05), ("Won't Do", 0.03)]
+PRIORITIES = [('Medium', 0.5), ('High', 0.2), ('Low', 0.2), ('Highest', 0.05), ('Lowest', 0.05)]
+POLICY_TYPES = ['General Liability', 'Workers Compensation', 'Commercial Property', 'Umbrella',
+                'Auto', 'Professional Liability', 'BOP', 'Cyber']
+INSURERS = ['Travelers', 'Hartford', 'Chubb', 'Liberty Mutual', 'Hiscox', 'Employers', 'Nationwide']
+COMPANY_WORDS = ['Acme', 'Blue', 'River', 'Summit', 'Oak', 'Harbor', 'Pioneer', 'Granite', 'Maple', 'Atlas',
+                 'Coastal', 'Keystone', 'Liberty', 'Northern', 'Union', 'Cedar']
+COMPANY_SUFFIXES = ['LLC', 'Inc', 'Corp', 'Partners', 'Group', 'Holdings', 'Bakery', 'Dental', 'Construction']
+PEOPLE = ['Jerry D Smith', 'Jennifer Entinger', 'Cassandra Fico', 'Maria Lopez', 'Sam Patel',
+          'Alex Chen', 'Priya Nair', 'Tom Becker', 'Dana Wright', 'Luis Ortega']
+
+
+def weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def make_issue(rng, number, now):
+    """One synthetic issue, as the dict upsert_issue() takes (description included)"""
+    category = rng.choices(list(CATEGORY_TEMPLATES), [t[0] for t in CATEGORY_TEMPLATES.values()])[0]
+    _, summaries, bodies = CATEGORY_TEMPLATES[category]
+
+    fields = {
+        'account': f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)}",
+        'policy_type': rng.choice(POLICY_TYPES),
+        'policy_number': f"{rng.choice('ABCDEFGH')}{rng.randint(100000, 999999)}",
+        'term': f"{rng.randint(2022, 2025)}-{rng.randint(2023, 2026)}",
+        'person': rng.choice(PEOPLE),
+        'amount': f"{rng.randint(500, 90000):,}",
+    }
+    summary = rng.choice(summaries).format(**fields)
+    description = (
+        f"Account Name: {fields['account']}\n"
+        f"Case #: {rng.randint(10000, 99999)}\n"
+        f"Policy Number: {fields['policy_number']}\n"
+        f"Policy Type: {fields['policy_type']}\n"
+        f"Insurer: {rng.choice(INSURERS)}\n\n"
+        + rng.choice(bodies).format(**fields)
+    )
+
+    # Uniform over the spread, but weekend tickets are mostly pushed to Monday
+    created = now - timedelta(seconds=rng.randint(0, DAYS_SPREAD * 86400))
+    if created.weekday() >= 5 and rng.random() < 0.8:
+        created += timedelta(days=7 - created.weekday())
+    created = min(created, now)
+    status = weighted(rng, STATUSES)
+    updated = min(created + timedelta(hours=rng.expovariate(1 / 72)), now)
+
+    category, confidence = categorize_issue(summary, description)
+    return {
+        'issue_key': f"{KEY_PREFIX}-{number}",
+        'summary': summary,
+        'description': description,
+        'status': status,
+        'priority': weighted(rng, PRIORITIES),
+        'category': category,
+        'confidence': confidence,
+        'created_date': created,
+        'updated_date': updated,
+        'assignee': rng.choice(PEOPLE) if rng.random() < 0.9 else 'Unassigned',
+        'reporter': rng.choice(PEOPLE),
+    }
+
+
+def reset(db):
+    """Delete previously generated issues from both tiers, tombstoned like any other deletion"""
+    return db.clear_issues(key_prefix=f"{KEY_PREFIX}-", include_archived=True)
+
+
+def generate(db, rows, seed=42):
+    """Insert rows synthetic issues in chunks, one commit (and data version) per chunk"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    start_number = 1 + sum(
+        db.session.query(table).filter(table.issue_key.like(f"{KEY_PREFIX}-%")).count()
+        for table in (Issue, ArchivedIssue)
+    )
+    started = time.perf_counter()
+
+    for offset in range(0, rows, CHUNK_SIZE):
+        issues = [make_issue(rng, start_number + offset + i, now) for i in range(min(CHUNK_SIZE, rows - offset))]
+
+        # Stamped up front with the version this chunk's commit will produce, since
+        # Core inserts bypass the flush hook that records new issues (and their rollup counts)
+        version = db.session.execute(select(DataVersion.version).where(DataVersion.id == 1)).scalar() + 1
+        descriptions = [IssueDescription(issue_key=i['issue_key'], text=i['description']) for i in issues]
+        db.session.execute(Issue.__table__.insert(), [
+            {**{k: v for k, v in i.items() if k != 'description'},
+             'last_fetched': now, 'row_version': version, 'created_version': version}
+            for i in issues
+        ])
+        db.session.execute(IssueDescription.__table__.insert(), [
+            {'issue_key': d.issue_key, 'body': d.body, 'length': d.length} for d in descriptions
+        ])
+        db.session.execute(text("""
+            INSERT INTO issue_search (issue_key, summary, description)
+            VALUES (:issue_key, :summary, :description)
+        """), [{'issue_key': i['issue_key'], 'summary': i['summary'], 'description': i['description']} for i in issues])
+        for issue in issues:
+            db.count_in_rollups(issue, 1)
+            # Lets the commit drop tombstones left by an earlier --reset
+            db.created_keys.add(issue['issue_key'])
+            db.note_change('generated', issue['issue_key'])
+        db.commit()
+
+        done = offset + len(issues)
+        elapsed = time.perf_counter() - started
+        print(f"  {done:,}/{rows:,} issues ({done / elapsed:,.0f} rows/s)", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic issues for load testing')
+    parser.add_argument('rows', type=int, help='number of issues to add, e.g. 10000, 100000 or 1000000')
+    parser.add_argument('--seed', type=int, default=42, help='random seed; the same seed gives the same data')
+    parser.add_argument('--reset', action='store_true', help='delete existing synthetic issues first')
+    args = parser.parse_args()
+    rows, seed = args.rows, args.seed
+
+    print("="*80)
+    print(f"GENERATING {rows:,} synthetic issues (seed {seed})")
+    print("="*80)
+
+    db = Database(os.getenv('DATABASE_PATH', './issues.db'))
+    if args.reset:
+        print(f"Deleted {reset(db):,} existing synthetic issues")
+
+    generate(db, rows, seed)
+
+    print(f"\n✅ Database now holds {db.count_issues():,} issues")
+    print("="*80)
+
+
+if __name__ == '__main__':
+    main()
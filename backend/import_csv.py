@@ -5,7 +5,7 @@ import csv
 import os
 from datetime import datetime
 from dotenv import load_dotenv
-from categorizer import categorize_issue
+from categorizer import categorize_changed
 from database import Database
 
 load_dotenv()
@@ -39,9 +39,17 @@ def import_csv(csv_path):
     error_count = 0
 
     with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+        rows = list(csv.DictReader(f))
 
-        for row in reader:
+        # Categorize every row at once, skipping issues whose text and rules are unchanged
+        texts = [
+            ((row.get('Issue key') or '').strip(), (row.get('Summary') or '').strip(),
+             (row.get('Description') or '').strip())
+            for row in rows
+        ]
+        categorized = categorize_changed(texts, db.get_categorization_state(key for key, _, _ in texts))
+
+        for row, categorization in zip(rows, categorized):
             try:
                 issue_key = row.get('Issue key', '').strip()
                 summary = row.get('Summary', '').strip()
@@ -61,17 +69,14 @@ def import_csv(csv_path):
                 created_date = parse_jira_date(created)
                 updated_date = parse_jira_date(updated)
 
-                # Categorize
-                category = categorize_issue(summary, description)
-
                 # Prepare data
                 issue_data = {
                     'issue_key': issue_key,
                     'summary': summary[:500] if summary else '',  # Limit length
-                    'description': description[:5000] if description else '',  # Limit length
+                    'description': description,
                     'status': status if status else 'Unknown',
                     'priority': priority if priority else 'None',
-                    'category': category,
+                    **categorization,
                     'created_date': created_date,
                     'updated_date': updated_date,
                     'assignee': assignee if assignee else 'Unassigned',
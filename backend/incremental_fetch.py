@@ -2,12 +2,13 @@
 Incremental fetch of new Jira issues using date filter
 Workaround for broken pagination by fetching only new issues since last update
 """
-from jira import JIRA
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
-from categorizer import categorize_issue
+from categorizer import categorize_changed
 from database import Database
+import metrics
+import time
 import requests
 from requests.auth import HTTPBasicAuth
 
@@ -39,7 +40,7 @@ class IncrementalFetcher:
         return latest_date.strftime('%Y-%m-%d')
 
     def fetch_new_issues(self, since_date=None):
-        """Fetch only issues created or updated since the given date"""
+        """Fetch only issues created or updated since the given date; raises if the Jira search fails"""
         if since_date is None:
             since_date = self.get_last_issue_date()
 
@@ -65,18 +66,20 @@ class IncrementalFetcher:
         }
 
         try:
-            response = requests.get(
-                url,
-                params=params,
-                auth=HTTPBasicAuth(self.jira_email, self.jira_token),
-                headers={'Accept': 'application/json'},
-                timeout=30
-            )
+            with metrics.jira_request('search') as record:
+                response = requests.get(
+                    url,
+                    params=params,
+                    auth=HTTPBasicAuth(self.jira_email, self.jira_token),
+                    headers={'Accept': 'application/json'},
+                    timeout=30
+                )
+                record(response)
 
             if response.status_code != 200:
                 print(f"Error: HTTP {response.status_code}", flush=True)
                 print(f"Response: {response.text}", flush=True)
-                return []
+                raise RuntimeError(f"Jira search failed: HTTP {response.status_code}")
 
             data = response.json()
             issues = data.get('issues', [])
@@ -85,21 +88,29 @@ class IncrementalFetcher:
 
             new_issues = []
             stored_count = 0
+            batch_start = time.perf_counter()
 
+            # Extract text
+            texts = []
             for issue_data in issues:
+                fields = issue_data.get('fields') or {}
+                description = fields.get('description', '')
+
+                # Handle description object/list
+                if isinstance(description, dict):
+                    description = str(description)
+                elif isinstance(description, list):
+                    description = ' '.join([str(item) for item in description])
+                texts.append((issue_data.get('key'), fields.get('summary', ''), description))
+
+            # Categorize all of them at once, skipping issues whose text and rules are unchanged
+            categorize_start = time.perf_counter()
+            categorized = categorize_changed(texts, self.db.get_categorization_state(key for key, _, _ in texts))
+            metrics.observe_categorize_batch(len(texts), time.perf_counter() - categorize_start)
+
+            for issue_data, (_, summary, description), categorization in zip(issues, texts, categorized):
                 try:
                     issue_key = issue_data.get('key')
-                    summary = issue_data['fields'].get('summary', '')
-                    description = issue_data['fields'].get('description', '')
-
-                    # Handle description object/list
-                    if isinstance(description, dict):
-                        description = str(description)
-                    elif isinstance(description, list):
-                        description = ' '.join([str(item) for item in description])
-
-                    # Categorize
-                    category = categorize_issue(summary, description)
 
                     # Parse dates
                     created = issue_data['fields'].get('created')
@@ -109,10 +120,10 @@ class IncrementalFetcher:
                     db_issue_data = {
                         'issue_key': issue_key,
                         'summary': summary,
-                        'description': str(description)[:5000],
+                        'description': str(description),
                         'status': issue_data['fields'].get('status', {}).get('name', 'Unknown'),
                         'priority': issue_data['fields'].get('priority', {}).get('name', 'None'),
-                        'category': category,
+                        **categorization,
                         'created_date': datetime.strptime(created, '%Y-%m-%dT%H:%M:%S.%f%z') if created else None,
                         'updated_date': datetime.strptime(updated, '%Y-%m-%dT%H:%M:%S.%f%z') if updated else None,
                         'assignee': issue_data['fields'].get('assignee', {}).get('displayName', 'Unassigned') if issue_data['fields'].get('assignee') else 'Unassigned',
@@ -127,7 +138,7 @@ class IncrementalFetcher:
                     new_issues.append({
                         'key': issue_key,
                         'summary': summary,
-                        'category': category,
+                        'category': categorization['category'],
                         'status': db_issue_data['status'],
                         'created': created
                     })
@@ -141,15 +152,16 @@ class IncrementalFetcher:
             # Commit all at once
             if stored_count > 0:
                 self.db.commit()
+                metrics.observe_ingest_batch(stored_count, time.perf_counter() - batch_start)
                 print(f"Successfully stored {stored_count} new issues", flush=True)
 
             return new_issues
 
         except Exception as e:
+            # Callers (the refresh job) record the run as failed
+            self.db.rollback()
             print(f"Error fetching issues: {str(e)}", flush=True)
-            import traceback
-            traceback.print_exc()
-            return []
+            raise
 
 
 if __name__ == '__main__':
@@ -9,6 +9,7 @@ from datetime import datetime
 from dotenv import load_dotenv
 from jira_client import JiraClient
 from database import Database
+from categorizer import categorize_changed
 
 # Load environment variables
 load_dotenv()
@@ -79,23 +80,27 @@ def main():
 
             print(f"  Retrieved {len(issues)} issues (Total in Jira: {total})")
 
-            # Process and store each issue
+            # Extract text
+            texts = []
             for issue in issues:
-                try:
-                    from categorizer import categorize_issue
+                fields = issue.get('fields') or {}
+                description = fields.get('description', '') or ''
 
-                    issue_key = issue['key']
-                    fields = issue['fields']
+                # Handle description object/dict from API v3
+                if isinstance(description, dict):
+                    description = str(description)
+                elif isinstance(description, list):
+                    description = ' '.join([str(item) for item in description])
+                texts.append((issue.get('key'), fields.get('summary', ''), str(description)))
 
-                    # Extract fields
-                    summary = fields.get('summary', '')
-                    description = fields.get('description', '') or ''
+            # Categorize the whole batch at once, skipping issues whose text and rules are unchanged
+            categorized = categorize_changed(texts, db.get_categorization_state(key for key, _, _ in texts))
 
-                    # Handle description object/dict from API v3
-                    if isinstance(description, dict):
-                        description = str(description)
-                    elif isinstance(description, list):
-                        description = ' '.join([str(item) for item in description])
+            # Process and store each issue
+            for issue, (_, summary, description), categorization in zip(issues, texts, categorized):
+                try:
+                    issue_key = issue['key']
+                    fields = issue['fields']
 
                     status = fields.get('status', {}).get('name', 'Unknown')
                     priority = fields.get('priority', {}).get('name', 'Medium')
@@ -111,17 +116,14 @@ def main():
                         created_date = None
                         updated_date = None
 
-                    # Categorize (ensure description is string)
-                    category = categorize_issue(summary, str(description))
-
                     # Prepare issue data
                     issue_data = {
                         'issue_key': issue_key,
                         'summary': summary,
-                        'description': str(description)[:5000],  # Limit length
+                        'description': str(description),
                         'status': status,
                         'priority': priority,
-                        'category': category,
+                        **categorization,
                         'created_date': created_date,
                         'updated_date': updated_date
                     }
@@ -1,12 +1,13 @@
 """
 Jira API client for fetching issues
 """
-from jira import JIRA
 from datetime import datetime
 import os
+import threading
 from dotenv import load_dotenv
-from categorizer import categorize_issue
-from database import Database
+from categorizer import categorize_changed
+import metrics
+import time
 
 load_dotenv()
 
@@ -21,16 +22,40 @@ class JiraClient:
         self.old_team_id = os.getenv('JIRA_OLD_TEAM_ID', '3516f16e-7578-4940-9443-0a02386ad88c')
         self.new_team_id = os.getenv('JIRA_NEW_TEAM_ID', '600c992b-5b41-41e6-989c-08b6aeb6d48d')
 
-        # Initialize Jira connection (use API v3)
-        self.jira = JIRA(
-            server=self.jira_url,
-            basic_auth=(self.jira_email, self.jira_token),
-            options={'rest_api_version': '3'}
-        )
-
-        # Initialize database
-        db_path = os.getenv('DATABASE_PATH', './issues.db')
-        self.db = Database(db_path)
+        # The Jira connection and the database are created on first use, so
+        # importing this module (and starting the API) makes no network calls
+        # and doesn't wait on schema checks
+        self._jira = None
+        self._db = None
+        self._lock = threading.Lock()
+        # Called just before the database is first opened, e.g. to attach query instrumentation
+        self.on_database_open = []
+
+    @property
+    def jira(self):
+        """Jira connection (use API v3)"""
+        if self._jira is None:
+            with self._lock:
+                if self._jira is None:
+                    from jira import JIRA
+                    self._jira = JIRA(
+                        server=self.jira_url,
+                        basic_auth=(self.jira_email, self.jira_token),
+                        options={'rest_api_version': '3'}
+                    )
+        return self._jira
+
+    @property
+    def db(self):
+        """Database connection"""
+        if self._db is None:
+            with self._lock:
+                if self._db is None:
+                    for hook in self.on_database_open:
+                        hook()
+                    from database import Database
+                    self._db = Database(os.getenv('DATABASE_PATH', './issues.db'))
+        return self._db
 
     def build_jql_query(self):
         """Build the JQL query for fetching issues"""
@@ -59,6 +84,7 @@ class JiraClient:
         total_fetched = 0
         stored_count = 0
         seen_issue_keys = set()  # Track seen issues to detect infinite loops
+        error = None  # Why the fetch stopped early, if it did
 
         while True:  # Fetch all issues (no limit)
             url = f"{self.jira_url}/rest/api/3/search/jql"
@@ -72,17 +98,20 @@ class JiraClient:
 
             try:
                 print(f"Fetching startAt={start_at}, maxResults={max_results}", flush=True)
-                response = requests.get(
-                    url,
-                    params=params,
-                    auth=HTTPBasicAuth(self.jira_email, self.jira_token),
-                    headers={'Accept': 'application/json'},
-                    timeout=30
-                )
+                with metrics.jira_request('search') as record:
+                    response = requests.get(
+                        url,
+                        params=params,
+                        auth=HTTPBasicAuth(self.jira_email, self.jira_token),
+                        headers={'Accept': 'application/json'},
+                        timeout=30
+                    )
+                    record(response)
 
                 if response.status_code != 200:
                     print(f"Error: HTTP {response.status_code}", flush=True)
                     print(f"Response: {response.text}", flush=True)
+                    error = f"HTTP {response.status_code}"
                     break
 
                 data = response.json()
@@ -109,22 +138,29 @@ class JiraClient:
                     break
                 seen_issue_keys.update(issue_keys)
                 print(f"New unique issues in this batch: {len(new_keys)}", flush=True)
+                batch_start = time.perf_counter()
+                batch_stored = stored_count
 
+                # Extract text
+                texts = []
                 for issue_data in batch_issues:
+                    fields = issue_data.get('fields') or {}
+                    description = fields.get('description', '')
+
+                    # Handle description object/list
+                    if isinstance(description, dict):
+                        description = str(description)
+                    elif isinstance(description, list):
+                        description = ' '.join([str(item) for item in description])
+                    texts.append((issue_data.get('key'), fields.get('summary', ''), description))
+
+                # Categorize the whole batch at once, skipping issues whose text and rules are unchanged
+                categorize_start = time.perf_counter()
+                categorized = categorize_changed(texts, self.db.get_categorization_state(key for key, _, _ in texts))
+                metrics.observe_categorize_batch(len(texts), time.perf_counter() - categorize_start)
+
+                for issue_data, (_, summary, description), categorization in zip(batch_issues, texts, categorized):
                     try:
-                        # Extract data
-                        summary = issue_data['fields'].get('summary', '')
-                        description = issue_data['fields'].get('description', '')
-
-                        # Handle description object/list
-                        if isinstance(description, dict):
-                            description = str(description)
-                        elif isinstance(description, list):
-                            description = ' '.join([str(item) for item in description])
-
-                        # Categorize (returns tuple of category and confidence)
-                        category, confidence = categorize_issue(summary, description)
-
                         # Parse dates
                         created = issue_data['fields'].get('created')
                         updated = issue_data['fields'].get('updated')
@@ -133,11 +169,10 @@ class JiraClient:
                         db_issue_data = {
                             'issue_key': issue_data.get('key'),
                             'summary': summary,
-                            'description': str(description)[:5000],  # Limit description length
+                            'description': str(description),
                             'status': issue_data['fields'].get('status', {}).get('name', 'Unknown'),
                             'priority': issue_data['fields'].get('priority', {}).get('name', 'None'),
-                            'category': category,
-                            'confidence': confidence,
+                            **categorization,
                             'created_date': datetime.strptime(created, '%Y-%m-%dT%H:%M:%S.%f%z') if created else None,
                             'updated_date': datetime.strptime(updated, '%Y-%m-%dT%H:%M:%S.%f%z') if updated else None,
                             'assignee': issue_data['fields'].get('assignee', {}).get('displayName', 'Unassigned') if issue_data['fields'].get('assignee') else 'Unassigned',
@@ -157,7 +192,10 @@ class JiraClient:
                 # Commit the entire batch at once
                 try:
                     self.db.commit()
+                    metrics.observe_ingest_batch(stored_count - batch_stored, time.perf_counter() - batch_start)
                 except Exception as e:
+                    self.db.rollback()
+                    error = error or f"commit failed: {str(e)}"
                     print(f"Error committing batch: {str(e)}", flush=True)
                     import traceback
                     traceback.print_exc()
@@ -174,21 +212,28 @@ class JiraClient:
 
             except Exception as e:
                 print(f"Error fetching batch at {start_at}: {str(e)}", flush=True)
+                error = str(e)
                 break
 
         print(f"Successfully stored {stored_count} issues in database", flush=True)
+        if error:
+            # Leave the last successful sync time alone, so the metric goes stale during an outage
+            print(f"⚠️  Fetch did not complete: {error}", flush=True)
+        else:
+            metrics.mark_sync_succeeded()
         return stored_count
 
-    def get_dashboard_data(self):
-        """Get all dashboard data from database"""
-        total_issues = len(self.db.get_all_issues())
+    def get_dashboard_data(self, db=None):
+        """Get all dashboard data from database (or from a snapshot view of it)"""
+        db = db or self.db
+        total_issues = db.count_issues()
 
         return {
             'total_issues': total_issues,
-            'category_stats': self.db.get_category_stats(),
-            'status_stats': self.db.get_status_stats(),
-            'priority_stats': self.db.get_priority_stats(),
-            'category_details': self.db.get_category_details(),
+            'category_stats': db.get_category_stats(),
+            'status_stats': db.get_status_stats(),
+            'priority_stats': db.get_priority_stats(),
+            'category_details': db.get_category_details(),
             'last_updated': datetime.utcnow().isoformat()
         }
 
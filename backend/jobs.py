@@ -0,0 +1,112 @@
+"""
+Coalesced background jobs with status tracking
+A JobCoordinator runs one kind of job at most once at a time in this worker.
+A request that arrives while a run is in flight queues a single follow-up run
+(the in-flight one may have started before the change it wants to pick up), and
+any further requests are merged into that follow-up. Every request gets the id
+of the run that answers it; runs are recorded in the database so any worker can
+report them at /jobs/{id}.
+"""
+import threading
+import traceback
+import uuid
+from datetime import datetime
+import leader
+
+
+class JobCoordinator:
+    """Merges requests for one job into the in-flight run or a single queued follow-up"""
+
+    def __init__(self, job_type, get_db, fn, exclusive=None):
+        # fn() does the work and returns a dict of counts for the run record; runs hold
+        # the exclusive lock, if given, so coordinators sharing one never run together
+        self.job_type = job_type
+        self.exclusive = exclusive or threading.Lock()
+        self.get_db = get_db
+        self.fn = fn
+        self.lock = threading.Lock()
+        self.running = None
+        self.queued = None
+
+    def submit(self, min_interval_seconds=0):
+        """
+        Request a run; returns (run id, 'started' | 'queued' | 'merged')
+        min_interval_seconds is passed to the lease (see leader.run_as_leader) when
+        this request starts a run; merged requests take the run's settings
+        """
+        with self.lock:
+            if self.queued is not None:
+                self.get_db().add_job_run_request(self.queued)
+                return self.queued, 'merged'
+
+            run_id = uuid.uuid4().hex
+            self.get_db().create_job_run(run_id, self.job_type, leader.WORKER_ID)
+            if self.running is not None:
+                self.queued = run_id
+                return run_id, 'queued'
+            self.running = run_id
+
+        threading.Thread(target=self._work, args=(run_id, min_interval_seconds), daemon=True).start()
+        return run_id, 'started'
+
+    def _work(self, run_id, min_interval_seconds):
+        """Run, then keep going while a follow-up was queued meanwhile"""
+        while run_id is not None:
+            try:
+                self._execute(run_id, min_interval_seconds)
+            except Exception as e:
+                # e.g. the database went away while recording the run; don't wedge the coordinator
+                print(f"[{datetime.now()}] Could not record {self.job_type} run {run_id}: {str(e)}")
+            with self.lock:
+                run_id, self.queued = self.queued, None
+                self.running = run_id
+            min_interval_seconds = 0
+
+    def _execute(self, run_id, min_interval_seconds):
+        with self.exclusive:
+            self._run(run_id, min_interval_seconds)
+
+    def _run(self, run_id, min_interval_seconds):
+        db = self.get_db()
+        db.update_job_run(run_id, state='running', started_at=datetime.utcnow())
+        counts = {}
+        try:
+            ran = leader.run_as_leader(
+                self.get_db, self.job_type, lambda: counts.update(self.fn() or {}), min_interval_seconds
+            )
+        except Exception as e:
+            print(f"[{datetime.now()}] Error during {self.job_type} run {run_id}: {str(e)}")
+            traceback.print_exc()
+            db.update_job_run(run_id, state='failed', finished_at=datetime.utcnow(), counts=counts, error=str(e))
+            return
+        # Not running means another worker holds the lease (or ran the job too recently)
+        db.update_job_run(
+            run_id, state='succeeded' if ran else 'skipped', finished_at=datetime.utcnow(), counts=counts
+        )
+
+    def status(self):
+        """Ids of this worker's in-flight and queued runs"""
+        with self.lock:
+            return {"running": self.running, "queued": self.queued}
+
+
+def describe_run(run):
+    """A run record as returned by /jobs/{id}"""
+    started, finished = run['started_at'], run['finished_at']
+    if started is None:
+        duration = None
+    else:
+        duration = round(((finished or datetime.utcnow()) - started).total_seconds(), 3)
+    return {
+        "id": run['id'],
+        "type": run['job_type'],
+        "state": run['state'],
+        "requests": run['requests'],
+        "worker": run['worker'],
+        "requested_at": run['requested_at'].isoformat() if run['requested_at'] else None,
+        "started_at": started.isoformat() if started else None,
+        "finished_at": finished.isoformat() if finished else None,
+        "duration_seconds": duration,
+        "counts": run['counts'],
+        "error": run['error']
+    }
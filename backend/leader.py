@@ -0,0 +1,51 @@
+"""
+Run background jobs on one worker at a time
+Every API worker (uvicorn/gunicorn processes, extra Render instances) runs the same
+scheduler, so each job first takes a lease row in the shared database. The worker
+that gets it runs the job and keeps the lease alive; the others skip that run. The
+lease also records the last run's outcome, which every worker can report.
+"""
+import os
+import socket
+import threading
+from datetime import datetime
+
+# A crashed leader's lease expires after this long; live leaders renew it every third of it
+LEASE_SECONDS = 300
+
+# This process, as recorded in the lease
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_as_leader(get_db, job_id, fn, min_interval_seconds=0):
+    """
+    Run fn() if this worker can take the lease for job_id; returns True if it ran
+    min_interval_seconds skips the run when any worker started job_id that recently,
+    which stops workers whose cron triggers fire a little later from repeating it
+    """
+    db = get_db()
+    if not db.try_acquire_lease(job_id, WORKER_ID, LEASE_SECONDS, min_interval_seconds):
+        print(f"[{datetime.now()}] Skipping {job_id}: another worker is running it or ran it recently")
+        return False
+
+    stopped = threading.Event()
+
+    def heartbeat():
+        while not stopped.wait(LEASE_SECONDS / 3):
+            if not db.renew_lease(job_id, WORKER_ID, LEASE_SECONDS):
+                print(f"[{datetime.now()}] Lost the lease for {job_id}")
+                return
+
+    renewer = threading.Thread(target=heartbeat, daemon=True)
+    renewer.start()
+    try:
+        fn()
+    except Exception as e:
+        db.release_lease(job_id, WORKER_ID, 'failed', str(e))
+        raise
+    else:
+        db.release_lease(job_id, WORKER_ID, 'succeeded')
+    finally:
+        stopped.set()
+        renewer.join()
+    return True
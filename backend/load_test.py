@@ -0,0 +1,255 @@
+"""
+Repeatable load test for the API endpoints
+Runs a fixed set of requests against every read endpoint in main.py (and the
+category edit endpoints with --include-writes), then reports throughput and
+p50/p95/p99 latency per endpoint. Results can be saved as a named baseline and
+later runs are compared against it, so regressions show up as numbers.
+
+Typical runs, after filling a database with generate_synthetic_data.py:
+
+    python load_test.py sqlite-100k --start-server --database-path ./synthetic-100k.db
+    python load_test.py postgres-100k --start-server --database-url postgresql://localhost/epic_synthetic
+    python load_test.py sqlite-100k --base-url http://localhost:8000 --save-baseline
+
+POST /refresh and /full-reload (they call Jira), the /events stream and
+/profiles (off unless profiling is configured) are not exercised. /jobs/{id} polls
+the run the scheduler reports, or an unknown id whose 404 comes from the same lookup.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import requests
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'load_test_baselines')
+
+SEARCH_TERMS = ['policy header', 'ssr', 'endorsement', 'premium invoice', 'acme', 'not in epic']
+CATEGORIES = ['Missing SSR', 'Missing Policy', 'Producer Updates', 'Endorsement Issues']
+
+# Synthetic databases usually have no job runs, so these scenarios count 404 as a normal answer
+NOT_FOUND_OK = {'job-status'}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def build_scenarios(base_url, include_writes):
+    """(name, method, path-or-callable, json body-or-callable, share of --requests) per endpoint"""
+    bootstrap = requests.get(f"{base_url}/bootstrap", timeout=300).json()['data']
+    version = bootstrap['version']
+    keys = [issue['issue_key'] for issue in bootstrap['issues']]
+    sample = random.Random(7).sample(keys, min(len(keys), 1000)) or ['NTRI-1']
+    runs = requests.get(f"{base_url}/scheduler/status", timeout=30).json()['runs']
+    job_id = next((run_id for job in runs.values() for run_id in (job['running'], job['queued']) if run_id),
+                  'load-test-unknown')
+
+    scenarios = [
+        ('root', 'GET', '/', None, 1.0),
+        ('health', 'GET', '/health', None, 1.0),
+        ('dashboard', 'GET', '/dashboard', None, 1.0),
+        ('bootstrap', 'GET', '/bootstrap', None, 0.25),
+        ('categories', 'GET', '/categories', None, 1.0),
+        ('status', 'GET', '/status', None, 1.0),
+        ('priority', 'GET', '/priority', None, 1.0),
+        ('category-details', 'GET', '/category-details', None, 1.0),
+        ('issues', 'GET', '/issues', None, 0.25),
+        ('issues-hot-filtered', 'GET', '/issues?include_archived=false&category=Missing%20SSR', None, 0.5),
+        ('issues-changes', 'GET', f"/issues/changes?since={max(version - 5, 0)}", None, 1.0),
+        ('issue-detail', 'GET', lambda i: f"/issues/{sample[i % len(sample)]}", None, 1.0),
+        ('search', 'GET', lambda i: f"/search?q={SEARCH_TERMS[i % len(SEARCH_TERMS)]}", None, 1.0),
+        ('trends', 'GET', '/trends', None, 1.0),
+        ('aggregate', 'GET', '/aggregate?dimensions=category,week', None, 1.0),
+        ('aggregate-filtered', 'GET', '/aggregate?dimensions=status,priority&category=Missing%20SSR', None, 1.0),
+        ('job-status', 'GET', f"/jobs/{job_id}", None, 1.0),
+        ('scheduler-status', 'GET', '/scheduler/status', None, 1.0),
+        ('metrics', 'GET', '/metrics', None, 1.0),
+        ('login', 'POST', f"/auth/login?password={os.getenv('DASHBOARD_PASSWORD', 'CoverWallet2025!')}", None, 1.0),
+        ('export-ndjson', 'GET', '/export/issues.ndjson', None, 0.05),
+        ('export-csv', 'GET', '/export/issues.csv', None, 0.05),
+        ('export-parquet', 'GET', '/export/issues.parquet', None, 0.05),
+    ]
+    if include_writes:
+        scenarios += [
+            ('override-one', 'PATCH', lambda i: f"/issues/{sample[i % len(sample)]}",
+             lambda i: {'category': CATEGORIES[i % len(CATEGORIES)]}, 0.5),
+            ('override-bulk-20', 'PATCH', '/issues', lambda i: {'updates': [
+                {'issue_key': sample[(i * 20 + j) % len(sample)], 'category': CATEGORIES[(i + j) % len(CATEGORIES)]}
+                for j in range(20)
+            ]}, 0.25),
+        ]
+    return scenarios
+
+
+def run_scenario(base_url, scenario, total, concurrency, bust_cache):
+    name, method, path, body, _ = scenario
+    local = threading.local()
+
+    def one(i):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        url = base_url + (path(i) if callable(path) else path)
+        if bust_cache and method == 'GET':
+            url += ('&' if '?' in url else '?') + f"_lt={time.time_ns()}"
+        payload = body(i) if callable(body) else body
+
+        start = time.perf_counter()
+        try:
+            response = local.session.request(method, url, json=payload, timeout=300)
+            content = response.content
+            ok = (response.status_code < 400 or response.status_code == 404 and name in NOT_FOUND_OK) \
+                and not content.startswith(b'{"success":false')
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        'requests': total,
+        'errors': sum(1 for _, ok in results if not ok),
+        'throughput_rps': round(total / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Names of scenarios whose p95 or throughput got worse than the baseline by more than threshold"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            continue
+        slower = result['p95_ms'] > base['p95_ms'] * (1 + threshold)
+        fewer = result['throughput_rps'] < base['throughput_rps'] * (1 - threshold)
+        if slower or fewer:
+            regressions.append(name)
+    return regressions
+
+
+def start_server(port, database_path=None, database_url=None):
+    env = dict(os.environ)
+    # All load comes from one client, which per-client rate limits would mostly turn away
+    env.setdefault('ADMISSION_RATE_LIMITS', 'off')
+    if database_url:
+        env['DATABASE_URL'] = database_url
+    else:
+        env.pop('DATABASE_URL', None)
+        env['DATABASE_PATH'] = database_path or './issues.db'
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env
+    )
+    for _ in range(120):
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/health", timeout=1).ok:
+                return server
+        except requests.RequestException:
+            pass
+        if server.poll() is not None:
+            raise RuntimeError('API server exited during startup')
+        time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError('API server did not become healthy within 60s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the dashboard API')
+    parser.add_argument('label', help='name for this setup, e.g. sqlite-100k; baselines are stored under it')
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--start-server', action='store_true', help='run uvicorn for the duration of the test')
+    parser.add_argument('--port', type=int, default=8765, help='port for --start-server')
+    parser.add_argument('--database-path', help='SQLite file for --start-server')
+    parser.add_argument('--database-url', help='PostgreSQL URL for --start-server')
+    parser.add_argument('--requests', type=int, default=200, help='requests per endpoint (heavy ones run fewer)')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--bust-cache', action='store_true', help='make every GET miss the response cache')
+    parser.add_argument('--include-writes', action='store_true', help='also run the category override endpoints')
+    parser.add_argument('--only', help='comma-separated scenario names')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown before flagging, 0.2 = 20%%')
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url.rstrip('/')
+    if args.start_server:
+        base_url = f"http://127.0.0.1:{args.port}"
+        server = start_server(args.port, args.database_path, args.database_url)
+
+    try:
+        scenarios = build_scenarios(base_url, args.include_writes)
+        if args.only:
+            wanted = set(args.only.split(','))
+            scenarios = [s for s in scenarios if s[0] in wanted]
+
+        baseline_path = os.path.join(BASELINE_DIR, f"{args.label}.json")
+        baseline = {}
+        if os.path.exists(baseline_path):
+            with open(baseline_path) as f:
+                baseline = json.load(f)
+
+        print("="*96)
+        print(f"LOAD TEST {args.label}: {base_url}, {args.requests} requests/endpoint, concurrency {args.concurrency}"
+              f"{', cache busted' if args.bust_cache else ''}")
+        print("="*96)
+        print(f"{'endpoint':<22} {'reqs':>6} {'errors':>6} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}"
+              f"  {'p95 vs baseline':>16}")
+
+        results = {}
+        for scenario in scenarios:
+            total = max(5, int(args.requests * scenario[4]))
+            result = run_scenario(base_url, scenario, total, args.concurrency, args.bust_cache)
+            results[scenario[0]] = result
+
+            base = baseline.get('results', {}).get(scenario[0])
+            delta = f"{(result['p95_ms'] / base['p95_ms'] - 1) * 100:+.0f}%" if base and base['p95_ms'] else ''
+            print(f"{scenario[0]:<22} {result['requests']:>6} {result['errors']:>6} {result['throughput_rps']:>10.1f} "
+                  f"{result['p50_ms']:>10.1f} {result['p95_ms']:>10.1f} {result['p99_ms']:>10.1f}  {delta:>16}",
+                  flush=True)
+
+        regressions = compare(results, baseline, args.threshold) if baseline else []
+        print("="*96)
+        if regressions:
+            print(f"⚠️  Regressions beyond {args.threshold:.0%} vs baseline: {', '.join(regressions)}")
+        elif baseline:
+            print(f"✅ No regressions beyond {args.threshold:.0%} vs baseline from {baseline.get('created_at')}")
+
+        if args.save_baseline:
+            os.makedirs(BASELINE_DIR, exist_ok=True)
+            with open(baseline_path, 'w') as f:
+                json.dump({
+                    'label': args.label,
+                    'created_at': datetime.utcnow().isoformat(),
+                    'settings': {
+                        'requests': args.requests, 'concurrency': args.concurrency,
+                        'bust_cache': args.bust_cache, 'include_writes': args.include_writes
+                    },
+                    'results': results
+                }, f, indent=2)
+            print(f"Saved baseline to {baseline_path}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,51 @@
 """
 FastAPI backend for EPIC Issues Dashboard
 """
-from fastapi import FastAPI, BackgroundTasks, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
-from datetime import datetime
+from datetime import date, datetime
+import hmac
 import os
+import threading
 from dotenv import load_dotenv
 from jira_client import JiraClient
-from incremental_fetch import IncrementalFetcher
 from datetime import timedelta
 from pydantic import BaseModel
+from typing import List, Optional
+from categorizer import CATEGORIES, categorize_changed
+import response_cache
+import compression
+import metrics
+import profiling
+import leader
+import admission
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from change_feed import ChangeFeed
+from jobs import JobCoordinator, describe_run
 
 load_dotenv()
 
-app = FastAPI(title="EPIC Issues Dashboard API")
+# orjson encodes responses, including datetimes, natively. Endpoints with large
+# payloads return ORJSONResponse directly, which also skips FastAPI's
+# jsonable_encoder pass over every nested value.
+app = FastAPI(title="EPIC Issues Dashboard API", default_response_class=ORJSONResponse)
+
+# Admission control sits closest to the endpoints, so cache hits never wait for
+# it. Cache read endpoints until the next commit bumps the data version, then
+# compress whatever JSON the cache didn't already serve pre-compressed. Latency
+# metrics and the opt-in request profiler wrap both, and all of them are
+# installed before CORS so CORS stays the outermost layer.
+admission.install(app)
+data_version = response_cache.DataVersionTracker(lambda: jira_client.db.get_data_version())
+cache = response_cache.install(app, data_version.current)
+compression.install(app)
+# Requests turned away by admission never reach routing, so label them by path
+metrics.install(app, cache, known_paths=response_cache.CACHEABLE_PATHS | admission.HEAVY_PATHS | admission.JOB_PATHS)
+profiling.install(app)
 
 # Configure CORS
 app.add_middleware(
@@ -26,24 +56,79 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Jira client
+# Initialize Jira client (cheap: its Jira connection and database are created on first use)
 jira_client = JiraClient()
+# SQLAlchemy is only imported once something needs the database
+jira_client.on_database_open += [metrics.instrument_queries, profiling.record_queries, data_version.follow_commits]
 
 # Scheduler for daily updates
 scheduler = BackgroundScheduler()
 
+# Pushes data version changes to connected dashboards
+change_feed = ChangeFeed(lambda: jira_client.db, on_version=data_version.note)
+
+
+# Scheduled runs are skipped if any worker started the same job this recently
+SCHEDULED_JOB_MIN_INTERVAL = 30 * 60
+
 
 def refresh_data():
-    """Background task to refresh Jira data - incremental updates only"""
+    """Refresh Jira data - incremental updates only; returns counts for the job record"""
     print(f"[{datetime.now()}] Starting incremental data refresh...")
+    from incremental_fetch import IncrementalFetcher
+    fetcher = IncrementalFetcher()
+    # Fetch issues from the last 7 days to catch any new or updated issues
+    since_date = (datetime.utcnow() - timedelta(days=7)).strftime('%Y-%m-%d')
+    new_issues = fetcher.fetch_new_issues(since_date=since_date)
+    print(f"[{datetime.now()}] Refresh complete. Fetched {len(new_issues)} new/updated issues.")
+    # Only reached when the fetch completed: fetch_new_issues raises on failure
+    metrics.mark_sync_succeeded()
+    return {"fetched": len(new_issues)}
+
+
+def full_reload_data():
+    """Reload all issues from Jira with bulk_import_by_keys.py"""
+    print(f"[{datetime.now()}] Starting full reload of all issues...")
+    import subprocess
+    import sys
+    result = subprocess.run(
+        [sys.executable, "bulk_import_by_keys.py"],
+        capture_output=True,
+        text=True
+    )
+    print(f"[{datetime.now()}] Full reload complete.")
+    print(result.stdout)
+    if result.stderr:
+        print("Errors:", result.stderr)
+    if result.returncode != 0:
+        raise RuntimeError(f"bulk_import_by_keys.py exited with {result.returncode}")
+    return {}
+
+
+# Manual and scheduled runs go through these, so overlapping requests share one run.
+# Both write every ingested issue, so a full reload waits for a running refresh and vice versa
+ingest_lock = threading.Lock()
+refresh_jobs = JobCoordinator('refresh', lambda: jira_client.db, refresh_data, exclusive=ingest_lock)
+full_reload_jobs = JobCoordinator('full_reload', lambda: jira_client.db, full_reload_data, exclusive=ingest_lock)
+
+
+def archive_closed_issues(min_interval_seconds=0):
+    """Background task to move long-closed issues into the archive tier, on one worker at a time"""
+    def run():
+        print(f"[{datetime.now()}] Archiving closed issues...")
+        # Its own session: the shared one is in use by requests on the event loop
+        from database import Database
+        db = Database(os.getenv('DATABASE_PATH', './issues.db'))
+        try:
+            archived = db.archive_closed_issues()
+        finally:
+            db.close()
+        print(f"[{datetime.now()}] Archived {archived} issues.")
+
     try:
-        fetcher = IncrementalFetcher()
-        # Fetch issues from the last 7 days to catch any new or updated issues
-        since_date = (datetime.utcnow() - timedelta(days=7)).strftime('%Y-%m-%d')
-        new_issues = fetcher.fetch_new_issues(since_date=since_date)
-        print(f"[{datetime.now()}] Refresh complete. Fetched {len(new_issues)} new/updated issues.")
+        leader.run_as_leader(lambda: jira_client.db, 'archive', run, min_interval_seconds)
     except Exception as e:
-        print(f"[{datetime.now()}] Error during refresh: {str(e)}")
+        print(f"[{datetime.now()}] Error during archiving: {str(e)}")
 
 
 @app.on_event("startup")
@@ -51,13 +136,23 @@ async def startup_event():
     """Initialize scheduler on startup"""
     # Schedule daily refresh at 2 AM
     scheduler.add_job(
-        refresh_data,
+        refresh_jobs.submit,
         CronTrigger(hour=2, minute=0),
         id='daily_refresh',
+        name='refresh',
+        kwargs={'min_interval_seconds': SCHEDULED_JOB_MIN_INTERVAL},
+        replace_existing=True
+    )
+    # Archive after the refresh so freshly reopened issues are already back in the hot table
+    scheduler.add_job(
+        archive_closed_issues,
+        CronTrigger(hour=3, minute=0),
+        id='daily_archive',
+        kwargs={'min_interval_seconds': SCHEDULED_JOB_MIN_INTERVAL},
         replace_existing=True
     )
     scheduler.start()
-    print("Scheduler started - daily refresh at 2:00 AM")
+    print("Scheduler started - daily refresh at 2:00 AM, archiving at 3:00 AM")
 
 
 @app.on_event("shutdown")
@@ -91,19 +186,42 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/dashboard": "Get complete dashboard data",
+            "/bootstrap": "Get dashboard data, all issues and trends in one response",
             "/refresh": "Manually trigger data refresh",
+            "/jobs/{id}": "State, counts and duration of a refresh or full reload",
             "/categories": "Get category statistics",
             "/status": "Get status statistics",
-            "/priority": "Get priority statistics"
+            "/priority": "Get priority statistics",
+            "/issues/changes": "Issues inserted, updated and deleted since a data version",
+            "/aggregate": "Issue counts by any of category, status, priority, assignee and week, with filters",
+            "/search": "Full-text search over issue summaries and descriptions",
+            "/export/issues.parquet": "Download the issues table as a Parquet file",
+            "/export/issues.ndjson": "Stream all issues as newline-delimited JSON",
+            "/export/issues.csv": "Stream all issues as CSV",
+            "/events": "Server-Sent Events stream of data version changes",
+            "/metrics": "Prometheus metrics"
         }
     }
 
 
+async def read_snapshot(render):
+    """
+    Run render(db) against a snapshot in a worker thread and return its result
+    Heavy reads (admission's "heavy" lane) go through here: each snapshot has its
+    own session and connection, so they can run in parallel off the event loop,
+    which stays free for /health and cached responses
+    """
+    def run():
+        with profiling.sampling_thread(), jira_client.db.snapshot() as db:
+            return render(db)
+    return await run_in_threadpool(run)
+
+
 @app.get("/dashboard")
 async def get_dashboard():
     """Get complete dashboard data"""
     try:
-        data = jira_client.get_dashboard_data()
+        data = await read_snapshot(jira_client.get_dashboard_data)
         return {
             "success": True,
             "data": data
@@ -115,41 +233,100 @@ async def get_dashboard():
         }
 
 
+@app.get("/bootstrap")
+async def get_bootstrap():
+    """Get dashboard, issue list and trends in one response from one consistent read"""
+    def render(db):
+        data = {
+            "version": db.read_data_version()[0],
+            "dashboard": jira_client.get_dashboard_data(db),
+            "issues": build_issue_list(db),
+            "trends": db.get_weekly_trends()
+        }
+        return ORJSONResponse({
+            "success": True,
+            "data": data
+        })
+
+    try:
+        return await read_snapshot(render)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+# What /refresh and /full-reload did with a request
+REFRESH_MESSAGES = {
+    "started": "Started in background",
+    "queued": "A run is in progress; queued to run again once it finishes",
+    "merged": "A follow-up run is already queued; this request will be answered by it"
+}
+
+
 @app.post("/refresh")
-async def refresh_issues(background_tasks: BackgroundTasks):
-    """Manually trigger data refresh"""
-    background_tasks.add_task(refresh_data)
+async def refresh_issues():
+    """Manually trigger data refresh; requests made while one runs share a single follow-up run"""
+    try:
+        job_id, state = refresh_jobs.submit()
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
     return {
         "success": True,
-        "message": "Data refresh started in background"
+        "message": REFRESH_MESSAGES[state],
+        "job_id": job_id,
+        "state": state
     }
 
 
+def is_admin(request):
+    """True if ADMIN_TOKEN is unset or the request carries it in X-Admin-Token"""
+    expected = os.getenv('ADMIN_TOKEN')
+    if not expected:
+        return True
+    token = request.headers.get('x-admin-token')
+    return token is not None and hmac.compare_digest(token, expected)
+
+
 @app.post("/full-reload")
-async def full_reload(background_tasks: BackgroundTasks):
+async def full_reload(request: Request):
     """Trigger full reload of all issues from Jira"""
-    def do_full_reload():
-        print(f"[{datetime.now()}] Starting full reload of all issues...")
-        try:
-            # Import bulk_import_by_keys and run it
-            import subprocess
-            import sys
-            result = subprocess.run(
-                [sys.executable, "bulk_import_by_keys.py"],
-                capture_output=True,
-                text=True
-            )
-            print(f"[{datetime.now()}] Full reload complete.")
-            print(result.stdout)
-            if result.stderr:
-                print("Errors:", result.stderr)
-        except Exception as e:
-            print(f"[{datetime.now()}] Error during full reload: {str(e)}")
-
-    background_tasks.add_task(do_full_reload)
+    if not is_admin(request):
+        raise HTTPException(status_code=403, detail="Full reload requires the admin token")
+    try:
+        job_id, state = full_reload_jobs.submit()
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+    return {
+        "success": True,
+        "message": REFRESH_MESSAGES[state],
+        "job_id": job_id,
+        "state": state
+    }
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """State, counts and duration of a refresh or full reload run"""
+    try:
+        run = jira_client.db.get_job_run(job_id)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     return {
         "success": True,
-        "message": "Full reload started in background. This will fetch all 357 issues from Jira."
+        "data": describe_run(run)
     }
 
 
@@ -211,7 +388,7 @@ async def get_priority():
 async def get_category_details():
     """Get detailed breakdown by category"""
     try:
-        details = jira_client.db.get_category_details()
+        details = await read_snapshot(lambda db: db.get_category_details())
         return {
             "success": True,
             "data": details
@@ -223,32 +400,143 @@ async def get_category_details():
         }
 
 
+def issue_to_dict(issue):
+    """Core details of one issue, as listed by /issues"""
+    return {
+        "issue_key": issue.issue_key,
+        "summary": issue.summary,
+        "status": issue.status,
+        "category": issue.category,
+        "confidence": issue.confidence if hasattr(issue, 'confidence') else 0.0,
+        "priority": issue.priority,
+        # Left as datetimes; orjson writes them as ISO 8601 strings
+        "created_date": issue.created_date,
+        "updated_date": issue.updated_date
+    }
+
+
+def build_issue_list(db, include_archived=True, category=None, status=None):
+    """All issues as dicts with core details, newest first"""
+    issues = db.get_all_issues()
+    if include_archived:
+        issues += db.get_archived_issues()
+    if category:
+        issues = [issue for issue in issues if issue.category == category]
+    if status:
+        issues = [issue for issue in issues if issue.status == status]
+    # Convert to simple dict format
+    issues_list = [issue_to_dict(issue) for issue in issues]
+    # Sort by issue number descending (newest first) - extract numeric part for proper sorting
+    issues_list.sort(key=lambda x: int(x['issue_key'].split('-')[1]), reverse=True)
+    return issues_list
+
+
 @app.get("/issues")
-async def get_all_issues():
+async def get_all_issues(include_archived: bool = True, category: str = None, status: str = None):
     """Get all issues with core details"""
+    def render(db):
+        return ORJSONResponse({
+            "success": True,
+            "data": build_issue_list(db, include_archived, category, status)
+        })
+
+    try:
+        return await read_snapshot(render)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+@app.get("/issues/changes")
+async def get_issue_changes(since: int, include_archived: bool = True):
+    """
+    Delta sync: issues inserted, updated and deleted after data version `since`
+    Clients apply the rows to their copy of /issues and pass back `version` next time;
+    `reset: true` means `since` is too old and the full list has to be fetched again
+    """
+    def render(db):
+        changes = db.get_changes(since)
+        if changes is None:
+            return {
+                "success": True,
+                "data": {"version": db.read_data_version()[0], "since": since, "reset": True}
+            }
+
+        changed = changes['issues']
+        deleted = changes['deleted']
+        if include_archived:
+            changed += changes['archived']
+        else:
+            # Archived issues drop out of a hot-only list
+            deleted += [issue.issue_key for issue in changes['archived']]
+
+        return ORJSONResponse({
+            "success": True,
+            "data": {
+                "version": changes['version'],
+                "since": since,
+                "reset": False,
+                "inserted": [issue_to_dict(i) for i in changed if (i.created_version or 0) > since],
+                "updated": [issue_to_dict(i) for i in changed if (i.created_version or 0) <= since],
+                "deleted": deleted
+            }
+        })
+
+    try:
+        return await read_snapshot(render)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+@app.get("/search")
+async def search_issues(q: str, limit: int = 50):
+    """Full-text search over issue summaries and descriptions"""
+    try:
+        results = await read_snapshot(lambda db: db.search_issues(q, limit=min(max(limit, 1), 500)))
+        return {
+            "success": True,
+            "data": results
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+@app.get("/issues/{issue_key}")
+async def get_issue_detail(issue_key: str):
+    """Get a single issue, including its full description"""
     try:
-        issues = jira_client.db.get_all_issues()
-        # Convert to simple dict format
-        issues_list = [
-            {
+        issue = jira_client.db.get_issue(issue_key, include_archived=True)
+
+        if not issue:
+            raise HTTPException(status_code=404, detail=f"Issue {issue_key} not found")
+
+        return {
+            "success": True,
+            "data": {
                 "issue_key": issue.issue_key,
                 "summary": issue.summary,
+                "description": jira_client.db.get_description(issue.issue_key),
                 "status": issue.status,
                 "category": issue.category,
-                "confidence": issue.confidence if hasattr(issue, 'confidence') else 0.0,
+                "confidence": issue.confidence,
+                "manual_category": issue.manual_category,
                 "priority": issue.priority,
+                "assignee": issue.assignee,
+                "reporter": issue.reporter,
                 "created_date": issue.created_date.isoformat() if issue.created_date else None,
                 "updated_date": issue.updated_date.isoformat() if issue.updated_date else None
             }
-            for issue in issues
-        ]
-        # Sort by issue number descending (newest first) - extract numeric part for proper sorting
-        issues_list.sort(key=lambda x: int(x['issue_key'].split('-')[1]), reverse=True)
-
-        return {
-            "success": True,
-            "data": issues_list
         }
+    except HTTPException:
+        raise
     except Exception as e:
         return {
             "success": False,
@@ -260,10 +548,62 @@ async def get_all_issues():
 async def get_weekly_trends():
     """Get week-over-week trend data"""
     try:
-        trends = jira_client.db.get_weekly_trends()
-        return {
+        trends = await read_snapshot(lambda db: db.get_weekly_trends())
+        return ORJSONResponse({
             "success": True,
             "data": trends
+        })
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+@app.get("/aggregate")
+async def aggregate_issues(dimensions: str = "category", category: str = None, status: str = None,
+                           priority: str = None, assignee: str = None,
+                           created_from: date = None, created_to: date = None):
+    """
+    Issue counts grouped by any of category, status, priority, assignee and week,
+    optionally filtered by those fields and a creation date range (whole weeks)
+    """
+    from database import AGGREGATE_DIMENSIONS
+
+    names = [name.strip() for name in dimensions.split(',') if name.strip()]
+    unknown = [name for name in names if name not in AGGREGATE_DIMENSIONS]
+    if unknown or len(set(names)) != len(names):
+        raise HTTPException(
+            status_code=400,
+            detail=f"dimensions must be distinct names from: {', '.join(AGGREGATE_DIMENSIONS)}"
+        )
+    filters = {
+        name: value for name, value in
+        (('category', category), ('status', status), ('priority', priority), ('assignee', assignee))
+        if value is not None
+    }
+
+    try:
+        results = jira_client.db.aggregate_issues(
+            names, filters,
+            created_from=datetime.combine(created_from, datetime.min.time()) if created_from else None,
+            created_to=datetime.combine(created_to, datetime.min.time()) if created_to else None
+        )
+        rows = []
+        for values, count in results:
+            row = dict(zip(names, values))
+            if row.get('week') is not None:
+                row['week'] = row['week'].date().isoformat()
+            row['count'] = count
+            rows.append(row)
+        return {
+            "success": True,
+            "data": {
+                "dimensions": names,
+                "filters": filters,
+                "total": sum(count for _, count in results),
+                "rows": rows
+            }
         }
     except Exception as e:
         return {
@@ -272,6 +612,63 @@ async def get_weekly_trends():
         }
 
 
+@app.get("/export/issues.parquet")
+def export_issues_parquet(include_description: bool = False, include_archived: bool = True):
+    """Stream all issues (archive included by default) as a dictionary-encoded Parquet file"""
+    from export_parquet import iter_parquet_bytes
+
+    filename = f"epic-issues-{datetime.utcnow().strftime('%Y-%m-%d')}.parquet"
+    return StreamingResponse(
+        iter_parquet_bytes(jira_client.db, include_description=include_description,
+                           include_archived=include_archived),
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@app.get("/export/issues.ndjson")
+def export_issues_ndjson(include_description: bool = False, include_archived: bool = True,
+                         category: str = None, status: str = None):
+    """Stream issues as newline-delimited JSON, one issue per line"""
+    from export_stream import iter_ndjson
+
+    filename = f"epic-issues-{datetime.utcnow().strftime('%Y-%m-%d')}.ndjson"
+    return StreamingResponse(
+        iter_ndjson(jira_client.db, include_description=include_description,
+                    include_archived=include_archived, category=category, status=status),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@app.get("/export/issues.csv")
+def export_issues_csv(include_description: bool = False, include_archived: bool = True,
+                      category: str = None, status: str = None):
+    """Stream issues as CSV"""
+    from export_stream import iter_csv
+
+    filename = f"epic-issues-{datetime.utcnow().strftime('%Y-%m-%d')}.csv"
+    return StreamingResponse(
+        iter_csv(jira_client.db, include_description=include_description,
+                 include_archived=include_archived, category=category, status=status),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@app.get("/events")
+async def stream_events(request: Request):
+    """Server-Sent Events: one event each time the data version changes"""
+    last_event_id = request.headers.get('last-event-id')
+    last_event_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
+    return StreamingResponse(
+        change_feed.stream(request, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -281,6 +678,31 @@ async def health_check():
     }
 
 
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus metrics in the text exposition format"""
+    return Response(generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+
+@app.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, request: Request, format: str = "json"):
+    """A saved request profile; format=folded returns the stacks for flamegraph.pl or speedscope"""
+    token = request.headers.get('x-profile-token') or request.query_params.get('profile_token')
+    if not profiling.is_authorized(token):
+        raise HTTPException(status_code=403, detail="Profiling is disabled or the token is wrong")
+
+    profile = profiling.load_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+
+    if format == "folded":
+        return Response(profile['folded'], media_type="text/plain")
+    return {
+        "success": True,
+        "data": profile
+    }
+
+
 @app.get("/scheduler/status")
 async def scheduler_status():
     """Get scheduler status and next run time"""
@@ -296,10 +718,19 @@ async def scheduler_status():
             "trigger": str(job.trigger)
         })
 
+    # Every worker schedules the same jobs; the lease decides which one runs them
+    try:
+        leases = jira_client.db.get_job_leases()
+    except Exception as e:
+        leases = {"error": str(e)}
+
     return {
         "success": True,
         "scheduler_running": scheduler.running,
+        "worker": leader.WORKER_ID,
         "jobs": job_info,
+        "runs": {"refresh": refresh_jobs.status(), "full_reload": full_reload_jobs.status()},
+        "leases": leases,
         "timezone": "UTC",
         "current_time": datetime.utcnow().isoformat()
     }
@@ -307,39 +738,33 @@ async def scheduler_status():
 
 # Pydantic model for category update
 class CategoryUpdate(BaseModel):
-    category: str
+    category: Optional[str]  # null drops the manual override
 
 
 @app.patch("/issues/{issue_key}")
 async def update_issue_category(issue_key: str, update: CategoryUpdate):
-    """Update the category of an issue"""
+    """Update the category of an issue; the override survives syncs until cleared with a null category"""
+    if update.category is not None and update.category not in CATEGORIES:
+        raise HTTPException(status_code=400, detail=f"Invalid category. Must be one of: {', '.join(CATEGORIES)}")
+
     try:
         from database import Issue
 
-        # Get the issue
+        # Get the issue (an archived issue moves back to the hot table when edited)
         issue = jira_client.db.session.query(Issue).filter_by(issue_key=issue_key).first()
+        if not issue:
+            issue = jira_client.db.restore_archived_issue(issue_key)
 
         if not issue:
             raise HTTPException(status_code=404, detail=f"Issue {issue_key} not found")
 
-        # Valid categories
-        valid_categories = [
-            'Missing SSR',
-            'Missing Policy Header',
-            'Missing Policy',
-            'Account/Client Missing',
-            'Producer Updates',
-            'Endorsement Issues',
-            'Premium/Data Entry Issues',
-            'Account Cleanup/Removal'
-        ]
-
-        if update.category not in valid_categories:
-            raise HTTPException(status_code=400, detail=f"Invalid category. Must be one of: {', '.join(valid_categories)}")
-
-        # Update category and set confidence to 100 (manual override)
-        issue.category = update.category
-        issue.confidence = 100.0
+        if update.category is None:
+            # Back to the automatic category for the issue's current text
+            categorization = categorize_changed([(issue_key, issue.summary, issue.description)], {})[0]
+            jira_client.db.unpin_category(issue, categorization)
+        else:
+            # Manual override, confidence 100
+            jira_client.db.pin_category(issue, update.category)
         jira_client.db.commit()
 
         return {
@@ -348,12 +773,67 @@ async def update_issue_category(issue_key: str, update: CategoryUpdate):
             "data": {
                 "issue_key": issue.issue_key,
                 "category": issue.category,
-                "confidence": issue.confidence
+                "confidence": issue.confidence,
+                "manual": issue.manual_category is not None
             }
         }
     except HTTPException:
         raise
     except Exception as e:
+        # Don't leave the shared session in a failed transaction with pending rollup deltas
+        jira_client.db.rollback()
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+# Pydantic models for bulk category updates
+class CategoryOverride(BaseModel):
+    issue_key: str
+    category: str
+
+
+class BulkCategoryUpdate(BaseModel):
+    updates: List[CategoryOverride]
+
+
+@app.patch("/issues")
+async def bulk_update_issue_categories(update: BulkCategoryUpdate):
+    """Update the categories of many issues in one transaction, reporting a result per key"""
+    try:
+        # Results come back in request order; a key listed twice takes its last category
+        results = {}
+        overrides = {}
+        for item in update.updates:
+            results[item.issue_key] = {"issue_key": item.issue_key, "result": "invalid_category"}
+            if item.category in CATEGORIES:
+                overrides[item.issue_key] = item.category
+            else:
+                overrides.pop(item.issue_key, None)
+
+        updated = 0
+        for issue_key, issue in jira_client.db.override_categories(overrides).items():
+            if issue is None:
+                results[issue_key] = {"issue_key": issue_key, "result": "not_found"}
+                continue
+            updated += 1
+            results[issue_key] = {
+                "issue_key": issue_key,
+                "result": "updated",
+                "category": issue.category,
+                "confidence": issue.confidence
+            }
+        if updated:
+            jira_client.db.commit()
+
+        return {
+            "success": True,
+            "message": f"Updated {updated} of {len(results)} issues",
+            "data": list(results.values())
+        }
+    except Exception as e:
+        jira_client.db.rollback()
         return {
             "success": False,
             "error": str(e)
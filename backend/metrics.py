@@ -0,0 +1,150 @@
+"""
+Prometheus metrics for the API, the database and Jira ingest
+Everything is recorded in-process and exposed in the text format at GET /metrics
+"""
+import time
+from contextlib import contextmanager
+from fastapi import Request
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# Short operations (queries, categorizer calls) need finer buckets than HTTP requests
+FAST_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+SQL_VERBS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE')
+
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route',
+    ['method', 'route', 'status']
+)
+DB_QUERY_SECONDS = Histogram(
+    'db_query_duration_seconds', 'Database statement execution time (count is the number of queries)',
+    ['operation'], buckets=FAST_BUCKETS
+)
+JIRA_REQUESTS = Counter(
+    'jira_requests_total', 'Jira API requests by HTTP status ("exception" when no response came back)',
+    ['operation', 'status']
+)
+JIRA_REQUEST_SECONDS = Histogram(
+    'jira_request_duration_seconds', 'Jira API request latency',
+    ['operation']
+)
+INGEST_BATCH_ROWS = Histogram(
+    'ingest_batch_rows', 'Issues stored per ingest batch',
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000)
+)
+INGEST_ROWS = Counter('ingest_rows_total', 'Issues stored by ingest')
+INGEST_ROWS_PER_SECOND = Gauge('ingest_rows_per_second', 'Throughput of the most recent ingest batch')
+CATEGORIZE_SECONDS = Histogram(
+    'categorizer_batch_duration_seconds', 'Time spent categorizing one batch of issues (a categorize_many call)',
+    buckets=FAST_BUCKETS
+)
+CATEGORIZE_ISSUES_PER_SECOND = Gauge('categorizer_issues_per_second', 'Throughput of the most recent categorized batch')
+LAST_SUCCESSFUL_SYNC = Gauge(
+    'last_successful_sync_timestamp_seconds', 'Unix time of the last Jira sync that completed without error'
+)
+ADMISSION_REJECTIONS = Counter(
+    'admission_rejections_total', 'Requests turned away by admission control ("rate" or "busy")',
+    ['lane', 'reason']
+)
+ADMISSION_WAIT_SECONDS = Histogram(
+    'admission_wait_seconds', 'Time admitted requests waited for a concurrency slot',
+    ['lane'], buckets=FAST_BUCKETS + (2.5, 5.0, 10.0)
+)
+ADMISSION_IN_FLIGHT = Gauge('admission_in_flight', 'Requests holding a concurrency slot', ['lane'])
+
+
+@contextmanager
+def jira_request(operation):
+    """Time a Jira API call; call the yielded function with the response to record its status"""
+    status = 'exception'
+
+    def record(response):
+        nonlocal status
+        status = str(response.status_code)
+
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        JIRA_REQUEST_SECONDS.labels(operation).observe(time.perf_counter() - start)
+        JIRA_REQUESTS.labels(operation, status).inc()
+
+
+def observe_ingest_batch(rows, seconds):
+    """Record one committed ingest batch"""
+    INGEST_BATCH_ROWS.observe(rows)
+    INGEST_ROWS.inc(rows)
+    if seconds > 0:
+        INGEST_ROWS_PER_SECOND.set(rows / seconds)
+
+
+def observe_categorize_batch(issues, seconds):
+    """Record one categorized batch"""
+    CATEGORIZE_SECONDS.observe(seconds)
+    if issues and seconds > 0:
+        CATEGORIZE_ISSUES_PER_SECOND.set(issues / seconds)
+
+
+def mark_sync_succeeded():
+    LAST_SUCCESSFUL_SYNC.set_to_current_time()
+
+
+def instrument_queries():
+    """Time every statement run by any engine in this process (the API's and the ingest jobs')"""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(Engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start'].pop()
+        verb = statement.lstrip()[:6].upper()
+        DB_QUERY_SECONDS.labels(verb if verb in SQL_VERBS else 'OTHER').observe(elapsed)
+
+    @event.listens_for(Engine, 'handle_error')
+    def handle_error(context):
+        # A failed statement never reaches after_cursor_execute
+        if context.connection is not None and context.connection.info.get('query_start'):
+            context.connection.info['query_start'].pop()
+
+
+class ResponseCacheCollector:
+    """Reports the response cache's own hit/miss counters at scrape time"""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def collect(self):
+        yield CounterMetricFamily('response_cache_hits', 'Responses served from the cache', value=self.cache.hits)
+        yield CounterMetricFamily('response_cache_misses', 'Cacheable requests rendered fresh', value=self.cache.misses)
+        yield GaugeMetricFamily('response_cache_entries', 'Responses currently cached', value=len(self.cache.entries))
+
+
+def install(app, cache=None, known_paths=()):
+    """
+    Record request latency per route template; requests answered before routing
+    (e.g. response cache hits) are labelled by path if it is in known_paths
+    """
+    if cache is not None:
+        REGISTRY.register(ResponseCacheCollector(cache))
+
+    @app.middleware("http")
+    async def metrics_middleware(request: Request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+
+        route = request.scope.get('route')
+        if route is not None:
+            label = route.path
+        elif request.url.path in known_paths:
+            label = request.url.path
+        else:
+            label = 'unmatched'
+        HTTP_REQUEST_SECONDS.labels(request.method, label, str(response.status_code)).observe(
+            time.perf_counter() - start
+        )
+        return response
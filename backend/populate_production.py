@@ -6,6 +6,7 @@ This bypasses Jira API pagination issues entirely
 
 import sqlite3
 import os
+import zlib
 from dotenv import load_dotenv
 from database import Database
 
@@ -28,10 +29,11 @@ def main():
     print(f"   Found {total} issues in local database")
 
     cursor.execute("""
-        SELECT issue_key, summary, description, status, priority, category, confidence,
-               created_date, updated_date, assignee, reporter
-        FROM issues
-        ORDER BY issue_key
+        SELECT i.issue_key, i.summary, d.body, i.status, i.priority, i.category, i.confidence,
+               i.created_date, i.updated_date, i.assignee, i.reporter
+        FROM issues i
+        LEFT JOIN issue_descriptions d ON d.issue_key = i.issue_key
+        ORDER BY i.issue_key
     """)
 
     local_issues = cursor.fetchall()
@@ -50,7 +52,7 @@ def main():
             issue_data = {
                 'issue_key': row[0],
                 'summary': row[1],
-                'description': row[2],
+                'description': zlib.decompress(row[2]).decode('utf-8') if row[2] else None,
                 'status': row[3],
                 'priority': row[4],
                 'category': row[5],
@@ -0,0 +1,184 @@
+"""
+On-demand profiling of single API requests
+Disabled unless PROFILING_TOKEN is set. A request carrying that token in the
+X-Profile-Token header (or ?profile_token=) runs under a stack sampler with every
+SQL statement timed, and the profile is saved for GET /profiles/{id}. Stacks are
+kept in the folded format that flamegraph.pl and speedscope read.
+"""
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from fastapi import Request, Response
+
+PROFILE_DIR = os.getenv('PROFILE_DIR', './profiles')
+
+# Oldest profiles are deleted beyond this many
+MAX_PROFILES = 50
+
+SAMPLE_INTERVAL = 0.001
+
+# Queries recorded for the profiled request currently running in this context
+current_queries = ContextVar('current_queries', default=None)
+
+# Sampler of the profiled request running in this context (worker threads inherit it)
+current_sampler = ContextVar('current_sampler', default=None)
+
+
+def is_authorized(token):
+    expected = os.getenv('PROFILING_TOKEN')
+    return bool(expected) and token is not None and hmac.compare_digest(token, expected)
+
+
+class StackSampler(threading.Thread):
+    """Samples threads' Python stacks at a fixed interval and counts identical stacks"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        # Worker threads doing part of the request are added while they do (see sampling_thread)
+        self.thread_ids = {thread_id}
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in list(self.thread_ids):
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                    stack.append(name.replace(';', ':'))
+                    frame = frame.f_back
+                if stack:
+                    self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    def folded(self):
+        """One "frame;frame;frame count" line per distinct stack"""
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+@contextmanager
+def sampling_thread():
+    """Also sample the current (worker) thread while it works for a profiled request"""
+    sampler = current_sampler.get()
+    if sampler is None:
+        yield
+        return
+    thread_id = threading.get_ident()
+    sampler.thread_ids.add(thread_id)
+    try:
+        yield
+    finally:
+        sampler.thread_ids.discard(thread_id)
+
+
+def record_queries():
+    """Time SQL statements for whichever profiled request is running in the current context"""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_queries.get() is not None:
+            conn.info['profile_query_start'] = time.perf_counter()
+
+    @event.listens_for(Engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        queries = current_queries.get()
+        start = conn.info.pop('profile_query_start', None)
+        if queries is not None and start is not None:
+            queries.append({
+                'statement': ' '.join(statement.split())[:1000],
+                'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+                'executemany': executemany
+            })
+
+
+def save_profile(profile):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(os.path.join(PROFILE_DIR, f"{profile['id']}.json"), 'w') as f:
+        json.dump(profile, f)
+
+    files = sorted(
+        (os.path.join(PROFILE_DIR, name) for name in os.listdir(PROFILE_DIR) if name.endswith('.json')),
+        key=os.path.getmtime
+    )
+    for path in files[:-MAX_PROFILES]:
+        os.remove(path)
+
+
+def load_profile(profile_id):
+    """A saved profile, or None"""
+    try:
+        uuid.UUID(profile_id)  # Only ids we generated; never arbitrary paths
+        with open(os.path.join(PROFILE_DIR, f"{profile_id}.json")) as f:
+            return json.load(f)
+    except (ValueError, OSError):
+        return None
+
+
+def install(app):
+    """Profile requests that present the profiling token (call record_queries() before the database is opened)"""
+
+    @app.middleware("http")
+    async def profiling_middleware(request: Request, call_next):
+        token = request.headers.get('x-profile-token') or request.query_params.get('profile_token')
+        if token is None or request.url.path.startswith('/profiles/') or not is_authorized(token):
+            return await call_next(request)
+
+        # Tells the response cache to render this request instead of serving a stored copy
+        request.state.profiling = True
+        queries = []
+        current_queries.set(queries)
+        # Async endpoints run on this (event loop) thread, which is what gets sampled
+        sampler = StackSampler(threading.get_ident())
+        current_sampler.set(sampler)
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            response = await call_next(request)
+            body = b''.join([chunk async for chunk in response.body_iterator])
+        finally:
+            sampler.stop()
+            current_queries.set(None)
+            current_sampler.set(None)
+        duration = time.perf_counter() - start
+
+        profile = {
+            'id': str(uuid.uuid4()),
+            'method': request.method,
+            'path': request.url.path,
+            'query': str(request.url.query),
+            'status': response.status_code,
+            'started_at': started_at.isoformat(),
+            'duration_ms': round(duration * 1000, 3),
+            'sample_interval_ms': SAMPLE_INTERVAL * 1000,
+            'samples': sum(sampler.stacks.values()),
+            'query_count': len(queries),
+            'query_ms': round(sum(q['duration_ms'] for q in queries), 3),
+            'queries': queries,
+            'folded': sampler.folded()
+        }
+        save_profile(profile)
+        print(f"Profiled {request.method} {request.url.path}: {profile['duration_ms']} ms, "
+              f"{len(queries)} queries, profile {profile['id']}")
+
+        headers = dict(response.headers)
+        headers['x-profile-id'] = profile['id']
+        headers['content-length'] = str(len(body))
+        return Response(content=body, status_code=response.status_code, headers=headers)
@@ -3,7 +3,7 @@ Recalculate confidence scores for all existing issues
 """
 import os
 from dotenv import load_dotenv
-from categorizer import categorize_issue
+from categorizer import categorize_changed
 from database import Database
 
 load_dotenv()
@@ -17,43 +17,51 @@ def recalculate_all_confidence():
     db_path = os.getenv('DATABASE_PATH', './issues.db')
     db = Database(db_path)
 
-    # Get all issues
-    issues = db.get_all_issues()
-    total = len(issues)
+    # Get all issues, loading their compressed descriptions in one batch
+    all_issues = db.get_all_issues(with_descriptions=True)
+    total = len(all_issues)
 
     print(f"Found {total} issues to process\n")
 
-    updated_count = 0
-    for i, issue in enumerate(issues, 1):
-        try:
-            # Recategorize with confidence
-            category, confidence = categorize_issue(issue.summary, issue.description)
+    # Categories set by hand are kept as they are
+    issues = [issue for issue in all_issues if issue.manual_category is None]
+    pinned = total - len(issues)
 
-            # Update the issue
-            issue.category = category
-            issue.confidence = confidence
+    # Recategorize with confidence, spread over every core; issues whose text and
+    # rules version match what their category was computed from are left alone
+    stored = {
+        issue.issue_key: (issue.text_hash, issue.rules_version, issue.category, issue.confidence, None)
+        for issue in issues
+    }
+    categorized = categorize_changed([(issue.issue_key, issue.summary, issue.description) for issue in issues], stored)
 
-            updated_count += 1
+    updated_count = 0
+    for issue, categorization in zip(issues, categorized):
+        state = (categorization['text_hash'], categorization['rules_version'],
+                 categorization['category'], categorization['confidence'], None)
+        if state == stored[issue.issue_key]:
+            continue
 
-            if i % 50 == 0:
-                print(f"Processed {i}/{total} issues...")
+        # Update the issue
+        for key, value in categorization.items():
+            setattr(issue, key, value)
 
-        except Exception as e:
-            print(f"Error processing {issue.issue_key}: {str(e)}")
-            continue
+        updated_count += 1
 
     # Commit all changes
     db.commit()
 
     print(f"\n{'='*80}")
-    print(f"✅ Successfully updated {updated_count}/{total} issues")
+    print(f"✅ Updated {updated_count}/{total} issues (the rest were unchanged)")
+    if pinned:
+        print(f"   Skipped {pinned} issues with a manual category")
     print(f"{'='*80}")
 
     # Show confidence distribution
     print("\n📊 Confidence Distribution:")
-    high_conf = len([i for i in issues if i.confidence >= 90])
-    medium_conf = len([i for i in issues if 60 <= i.confidence < 90])
-    low_conf = len([i for i in issues if i.confidence < 60])
+    high_conf = len([i for i in all_issues if i.confidence >= 90])
+    medium_conf = len([i for i in all_issues if 60 <= i.confidence < 90])
+    low_conf = len([i for i in all_issues if i.confidence < 60])
 
     print(f"   High (≥90%): {high_conf} issues ({high_conf/total*100:.1f}%)")
     print(f"   Medium (60-89%): {medium_conf} issues ({medium_conf/total*100:.1f}%)")
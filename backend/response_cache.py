@@ -0,0 +1,210 @@
+"""
+In-process cache for read-only API responses
+Entries are keyed by path and query string and are only valid for the data version
+they were rendered at; any commit bumps the version and invalidates them all.
+The version is kept in the process, so serving an entry needs no database work
+"""
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from threading import Lock
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+import compression
+
+# Seconds a data version read from the database is trusted. Commits made in this
+# process update it at once; this bounds how long commits by other processes
+# (other workers, the full reload subprocess) go unnoticed
+VERSION_TTL = float(os.getenv('RESPONSE_CACHE_VERSION_TTL', 1.0))
+
+# GET routes whose responses depend only on the stored data
+CACHEABLE_PATHS = {
+    '/bootstrap',
+    '/dashboard',
+    '/categories',
+    '/status',
+    '/priority',
+    '/category-details',
+    '/issues',
+    '/issues/changes',
+    '/trends',
+    '/aggregate',
+}
+
+
+class CachedResponse:
+    """Serialized response body plus the validators sent with it"""
+
+    def __init__(self, body, media_type, version, updated_at):
+        self.body = body
+        self.media_type = media_type
+        self.version = version
+        self.digest = hashlib.sha1(body).hexdigest()[:20]
+        self.etag = f'"{self.digest}"'
+        # Compressed bodies by content-coding, built on first request for each
+        self.variants = {}
+        self.last_modified = format_datetime(
+            updated_at.replace(tzinfo=timezone.utc), usegmt=True
+        ) if updated_at else None
+        self.updated_at = updated_at
+
+    def variant(self, encoding):
+        """Body in the given content-coding (None for identity), compressing it once"""
+        if encoding is None:
+            return self.body
+        if encoding not in self.variants:
+            self.variants[encoding] = compression.compress(self.body, encoding, compression.CACHED_LEVELS)
+        return self.variants[encoding]
+
+    def headers(self, encoding=None):
+        # Each representation gets its own strong ETag
+        etag = f'"{self.digest}-{encoding}"' if encoding else self.etag
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        if self.last_modified:
+            headers['Last-Modified'] = self.last_modified
+        if encoding:
+            headers['Content-Encoding'] = encoding
+        return headers
+
+    def is_not_modified(self, request):
+        """True if the client's conditional headers show it already has this body"""
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match:
+            # Any representation of this body counts: "<digest>" or "<digest>-<coding>"
+            tags = [tag.strip().removeprefix('W/').strip('"') for tag in if_none_match.split(',')]
+            return any(tag == '*' or tag.split('-')[0] == self.digest for tag in tags)
+
+        if_modified_since = request.headers.get('if-modified-since')
+        if if_modified_since and self.updated_at:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return self.updated_at.replace(tzinfo=timezone.utc, microsecond=0) <= since
+        return False
+
+    def to_response(self, request):
+        encoding = compression.negotiate(request.headers.get('accept-encoding'))
+        if len(self.body) < compression.MINIMUM_SIZE:
+            encoding = None
+
+        if self.is_not_modified(request):
+            headers = self.headers(encoding)
+            headers.pop('Content-Encoding', None)
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.variant(encoding), media_type=self.media_type, headers=self.headers(encoding))
+
+
+class ResponseCache:
+    """LRU of rendered responses for the current data version"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    @staticmethod
+    def key_for(request):
+        return request.url.path + '?' + urlencode(sorted(request.query_params.multi_items()))
+
+    def get(self, key, version):
+        with self.lock:
+            if version != self.version:
+                # Data changed since these were rendered
+                self.entries.clear()
+                self.version = version
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self.lock:
+            if entry.version != self.version:
+                return
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class DataVersionTracker:
+    """The current (version, updated_at), updated by local commits and re-read from the database after VERSION_TTL"""
+
+    def __init__(self, read, ttl=VERSION_TTL):
+        self.read = read
+        self.ttl = ttl
+        self.value = None
+        self.checked_at = 0.0
+        self.lock = Lock()
+
+    def note(self, version, updated_at):
+        """Record a version seen by a commit or a poll; older ones (a read that raced a commit) are ignored"""
+        with self.lock:
+            if self.value is None or version >= self.value[0]:
+                self.value = (version, updated_at)
+                self.checked_at = time.monotonic()
+
+    def follow_commits(self):
+        """Note every commit made by any Database in this process (run before the database is first opened)"""
+        import database
+        database.COMMIT_LISTENERS.append(self.note)
+
+    async def current(self):
+        if self.value is None or time.monotonic() - self.checked_at >= self.ttl:
+            # Off the event loop: a slow database must not stall other requests
+            self.note(*await run_in_threadpool(self.read))
+        return self.value
+
+
+def install(app, get_data_version, cache=None):
+    """
+    Serve CACHEABLE_PATHS from the cache, with ETag/Last-Modified revalidation
+    get_data_version is a coroutine function returning (version, updated_at), e.g. DataVersionTracker.current
+    """
+    cache = cache or ResponseCache()
+
+    @app.middleware("http")
+    async def response_cache_middleware(request: Request, call_next):
+        if request.method != 'GET' or request.url.path not in CACHEABLE_PATHS:
+            return await call_next(request)
+        if getattr(request.state, 'profiling', False):
+            # A profile of a cache hit would show nothing
+            return await call_next(request)
+
+        # Read the version before rendering so a concurrent write can only
+        # make the stored entry look older than it is, never newer
+        version, updated_at = await get_data_version()
+        key = cache.key_for(request)
+
+        entry = cache.get(key, version)
+        if entry is not None:
+            return entry.to_response(request)
+
+        response = await call_next(request)
+        body = b''.join([chunk async for chunk in response.body_iterator])
+
+        # Endpoints report failures as {"success": false, ...}; never cache those
+        if response.status_code != 200 or not body.startswith(b'{"success":true'):
+            return Response(content=body, status_code=response.status_code, headers=dict(response.headers))
+
+        media_type = response.headers.get('content-type', 'application/json')
+        entry = CachedResponse(body, media_type, version, updated_at)
+        cache.put(key, entry)
+        return entry.to_response(request)
+
+    return cache
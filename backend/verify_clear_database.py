@@ -0,0 +1,83 @@
+"""
+Check that a cleared database can be filled again
+Ingests synthetic issues into a scratch SQLite database, runs clear_database(),
+then ingests the same keys again (as the refresh after a reset does), and checks
+that the clear moved the data version on and reported every issue as deleted to
+delta sync, and that every issue, its description, its search text and its rollup count came back.
+Exits with status 1 on any failure.
+
+Usage: python verify_clear_database.py [--issues 200]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime
+from sqlalchemy import func, text
+from clear_database import clear_database
+from database import Database, Issue, IssueDescription, IssueRollup
+from generate_synthetic_data import make_issue
+
+
+def ingest(db, issues):
+    for issue in issues:
+        db.upsert_issue(dict(issue), commit=False)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that clear_database.py leaves a database that can be refilled')
+    parser.add_argument('--issues', type=int, default=200)
+    args = parser.parse_args()
+
+    # A scratch SQLite database, whatever DATABASE_URL says
+    os.environ.pop('DATABASE_URL', None)
+    rng = random.Random(1)
+    now = datetime.utcnow()
+    issues = [make_issue(rng, i, now) for i in range(args.issues)]
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'issues.db')
+        db = Database(path)
+        ingest(db, issues)
+        since, _ = db.get_data_version()
+
+        clear_database(db)
+
+        version, _ = db.get_data_version()
+        changes = db.get_changes(since)
+        if version <= since:
+            failures.append(f'data version {version} did not move on from {since}')
+        if changes is None or sorted(changes['deleted']) != sorted(issue['issue_key'] for issue in issues):
+            failures.append('delta sync does not report every cleared issue as deleted')
+
+        try:
+            ingest(db, issues)
+        except Exception as e:
+            failures.append(f'ingest after clear failed: {e}')
+            db.rollback()
+
+        count = db.session.query(func.count(Issue.issue_key)).scalar()
+        descriptions = db.session.query(func.count(IssueDescription.issue_key)).scalar()
+        indexed = db.session.execute(text("SELECT COUNT(*) FROM issue_search")).scalar()
+        counted = db.session.query(func.sum(IssueRollup.count)).scalar()
+        for label, value in (('issues', count), ('descriptions', descriptions), ('search rows', indexed),
+                             ('rollup total', counted)):
+            if value != len(issues):
+                failures.append(f'{label}: {value}, expected {len(issues)}')
+        if db.get_changes(since)['deleted']:
+            failures.append('issues ingested again are still reported as deleted')
+        if not failures and db.get_description(issues[0]['issue_key']) != issues[0]['description']:
+            failures.append(f"description of {issues[0]['issue_key']} differs")
+        db.close()
+
+    for failure in failures:
+        print(f'  {failure}')
+    print('✅ Database refilled after clear' if not failures else f'❌ {len(failures)} failures')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
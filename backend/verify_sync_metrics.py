@@ -0,0 +1,87 @@
+"""
+Check that last_successful_sync_timestamp_seconds only moves on completed syncs
+Runs the refresh job's fetch (main.refresh_data) and the full fetch
+(JiraClient.fetch_and_store_issues) against a local stand-in for the Jira search
+API that fails with HTTP 503, then against an unreachable one, then against one
+that answers with an empty result. The gauge must stay put for the failures and
+advance for the successes. Uses a scratch SQLite database; exits with status 1
+on any failure.
+
+Usage: python verify_sync_metrics.py
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+
+class FakeJira(BaseHTTPRequestHandler):
+    """Answers every request with the server's status and an empty search result"""
+
+    def do_GET(self):
+        body = json.dumps({'issues': [], 'isLast': True, 'total': 0}).encode()
+        self.send_response(self.server.status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    tmp = tempfile.mkdtemp()
+    os.environ.pop('DATABASE_URL', None)
+    os.environ['DATABASE_PATH'] = os.path.join(tmp, 'issues.db')
+    os.environ['ADMISSION_RATE_LIMITS'] = 'off'
+
+    server = HTTPServer(('127.0.0.1', 0), FakeJira)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    from prometheus_client import REGISTRY
+    from jira_client import JiraClient
+    import main as api
+
+    def last_sync():
+        return REGISTRY.get_sample_value('last_successful_sync_timestamp_seconds')
+
+    def refresh():
+        try:
+            api.refresh_data()
+        except Exception:
+            pass
+
+    def full_fetch():
+        JiraClient().fetch_and_store_issues()
+
+    failures = []
+    for jira_url, status, should_advance in (
+        (f'http://127.0.0.1:{server.server_port}', 503, False),
+        ('http://127.0.0.1:9', None, False),  # Nothing listens on the discard port
+        (f'http://127.0.0.1:{server.server_port}', 200, True),
+    ):
+        os.environ['JIRA_URL'] = jira_url
+        server.status = status
+        for label, fn in (('refresh_data', refresh), ('fetch_and_store_issues', full_fetch)):
+            before = last_sync()
+            time.sleep(0.01)
+            fn()
+            advanced = last_sync() != before
+            outcome = f'HTTP {status}' if status else 'unreachable'
+            print(f"  {label:<24} {outcome:<12} gauge {'advanced' if advanced else 'unchanged'}")
+            if advanced != should_advance:
+                failures.append(f'{label} with Jira {outcome}')
+
+    server.shutdown()
+    for failure in failures:
+        print(f'  wrong gauge: {failure}')
+    print('✅ Sync time only advances on completed syncs' if not failures else f'❌ {len(failures)} failures')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { BarChart, Bar, PieChart, Pie, Cell, LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
 import axios from 'axios';
 import './Dashboard.css';
@@ -12,6 +12,8 @@ const Dashboard = ({ onLogout }) => {
   const [refreshing, setRefreshing] = useState(false);
   const [lastUpdated, setLastUpdated] = useState(null);
   const [updatingIssue, setUpdatingIssue] = useState(null);
+  // Data version of what is on screen; change events for the same version are ignored
+  const loadedVersion = useRef(null);
 
   const COLORS = ['#3b82f6', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6', '#ec4899', '#06b6d4'];
 
@@ -30,36 +32,30 @@ const Dashboard = ({ onLogout }) => {
   const fetchDashboardData = async () => {
     const API_URL = process.env.REACT_APP_API_URL || '';
     try {
-      const [dashboardResponse, issuesResponse, trendsResponse] = await Promise.all([
-        axios.get(`${API_URL}/dashboard`),
-        axios.get(`${API_URL}/issues`),
-        axios.get(`${API_URL}/trends`)
-      ]);
-
-      if (dashboardResponse.data.success) {
-        const data = dashboardResponse.data.data;
-
-        // Add percentages to category data
-        const total = data.total_issues;
-        const categoryData = data.category_stats.map(cat => ({
-          ...cat,
-          percentage: total > 0 ? ((cat.value / total) * 100).toFixed(1) : 0
-        }));
-
-        setDashboardData({
-          ...data,
-          category_stats: categoryData
-        });
-        setLastUpdated(new Date(data.last_updated));
-      }
+      // One request returns dashboard stats, issues and trends from the same snapshot
+      const response = await axios.get(`${API_URL}/bootstrap`);
 
-      if (issuesResponse.data.success) {
-        setAllIssues(issuesResponse.data.data);
+      if (!response.data.success) {
+        throw new Error(response.data.error);
       }
 
-      if (trendsResponse.data.success) {
-        setTrendsData(trendsResponse.data.data);
-      }
+      const { version, dashboard: data, issues, trends } = response.data.data;
+      loadedVersion.current = version;
+
+      // Add percentages to category data
+      const total = data.total_issues;
+      const categoryData = data.category_stats.map(cat => ({
+        ...cat,
+        percentage: total > 0 ? ((cat.value / total) * 100).toFixed(1) : 0
+      }));
+
+      setDashboardData({
+        ...data,
+        category_stats: categoryData
+      });
+      setLastUpdated(new Date(data.last_updated));
+      setAllIssues(issues);
+      setTrendsData(trends);
 
       setLoading(false);
     } catch (err) {
@@ -163,9 +159,17 @@ const Dashboard = ({ onLogout }) => {
 
   useEffect(() => {
     fetchDashboardData();
-    // Refresh data every 5 minutes
-    const interval = setInterval(fetchDashboardData, 5 * 60 * 1000);
-    return () => clearInterval(interval);
+
+    // The backend pushes an event whenever the data changes, so only refetch then
+    const API_URL = process.env.REACT_APP_API_URL || '';
+    const events = new EventSource(`${API_URL}/events`);
+    events.addEventListener('data-version', (event) => {
+      const { version } = JSON.parse(event.data);
+      if (loadedVersion.current !== null && version !== loadedVersion.current) {
+        fetchDashboardData();
+      }
+    });
+    return () => events.close();
   }, []);
 
   if (loading) {